@@ -5,6 +5,8 @@ Handles Twilio webhooks, dashboard APIs, and real-time voice processing
 
 from fastapi import FastAPI, Request, Response, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import logging
@@ -154,6 +156,22 @@ async def lifespan(app: FastAPI):
     yield
     
     logger.info("🛑 Shutting down Voice Agent System...")
+    try:
+        from routers.twilio import flush_pending_session_writes
+        await flush_pending_session_writes()
+    except Exception as e:
+        logger.warning(f"⚠️ Session flush warning: {e}")
+    
+    try:
+        from services.http_client import close_shared_http_client
+        from services.elevenlabs_client import elevenlabs_client
+        from services.lyzr_client import lyzr_client
+        await close_shared_http_client()
+        await elevenlabs_client.close()
+        await lyzr_client.close()
+    except Exception as e:
+        logger.warning(f"⚠️ HTTP client close warning: {e}")
+    
     try:
         if 'close_database' in globals():
             await close_database()
@@ -166,7 +184,8 @@ app = FastAPI(
     title="Voice Agent Production System",
     description="Production-ready voice agent with dashboard and testing capabilities",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -178,10 +197,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (TwiML with long prompts, debug listings); small webhooks pass through untouched
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+class AudioCachingStaticFiles(StaticFiles):
+    """Static files where generated audio is marked cacheable"""
+    
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        # Generated audio files never change once written, so let Twilio's media fetcher cache them
+        if os.path.abspath(full_path).startswith(static_audio_dir + os.sep):
+            response.headers["Cache-Control"] = "public, max-age=86400"
+        return response
+
 # Serve static files (for audio files)
 static_dir = os.path.join(os.getcwd(), "static")
+static_audio_dir = os.path.join(static_dir, "audio")
 os.makedirs(static_dir, exist_ok=True)
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+app.mount("/static", AudioCachingStaticFiles(directory=static_dir), name="static")
 
 # Include routers - CRITICAL: This must happen AFTER app creation
 app.include_router(twilio_router)
@@ -325,4 +358,4 @@ async def debug_routes():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True, loop="uvloop", http="httptools")
\ No newline at end of file
@@ -20,19 +20,16 @@ from shared.models.client import Client, ClientInfo, CampaignStatus, CallOutcome
 from shared.models.call_session import CallSession, CallStatus
 
 # Import services
-from services.voice_processor import VoiceProcessor
-from services.hybrid_tts import HybridTTSService
+from services.voice_processor import voice_processor
+from services.hybrid_tts import hybrid_tts
 from services.lyzr_client import lyzr_client
 from services.elevenlabs_client import elevenlabs_client
 from services.deepgram_client import deepgram_client
+from services.tts_prewarm import schedule_greeting_prerender
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
-# Initialize services
-voice_processor = VoiceProcessor()
-hybrid_tts = HybridTTSService()
-
 # Add caching for system health
 _system_health_cache: Dict[str, Any] = {}
 _cache_timestamp: Optional[datetime] = None
@@ -709,6 +706,14 @@ async def initiate_test_call(call_request: TestCallRequest):
             
             logger.info(f"✅ Test call initiated: {call.sid}")
             
+            # Render the greeting while the phone rings so pickup doesn't wait on TTS
+            schedule_greeting_prerender(call.sid, {
+                "client_name": client.client.first_name,
+                "first_name": client.client.first_name,
+                "agent_name": agent.name,
+                "last_agent": agent.name
+            })
+            
             # Create initial session for tracking
             from shared.models.call_session import CallSession
             session = CallSession(
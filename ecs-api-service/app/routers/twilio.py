@@ -3,46 +3,124 @@ Production-Ready Twilio Router
 Handles all customer responses with hybrid TTS and complete conversation flow
 """
 
-from fastapi import APIRouter, Request, Form, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Request, Form, HTTPException
 from fastapi.responses import Response
 import uuid
+from collections import OrderedDict
+from functools import lru_cache
 import os
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Set, Tuple
 import logging
 import asyncio
-from datetime import datetime
+import orjson
+from datetime import datetime, timedelta
 import time
+import traceback
+from xml.sax.saxutils import escape as xml_escape
 
 # Import shared models and utilities
 from shared.config.settings import settings
-from shared.models.call_session import CallSession, ConversationStage, ConversationTurn, ResponseType
+from shared.models.call_session import CallSession, ConversationStage, ConversationTurn, ResponseType, SessionMetrics
 from shared.models.call_session import CallStatus as CallStatusEnum
 from shared.models.client import Client, CallOutcome, CRMTag
+from shared.utils.redis_client import redis_client
 
 # Import services
-from services.voice_processor import VoiceProcessor
-from services.hybrid_tts import HybridTTSService
+from services.voice_processor import voice_processor
+from services.hybrid_tts import hybrid_tts
 from services.lyzr_client import lyzr_client
 from services.twiml_helpers import create_simple_twiml, create_hangup_twiml
+from services.tts_prewarm import schedule_tts_prewarm, get_prewarmed_audio
 
 logger = logging.getLogger(__name__)
+if settings.twilio_log_level:
+    logger.setLevel(settings.twilio_log_level.upper())
 router = APIRouter(prefix="/twilio", tags=["Twilio"])
 
+# Calls that never deliver a terminal status callback would otherwise stay in memory forever
+ACTIVE_SESSION_MAX = 10000
+ACTIVE_SESSION_MAX_AGE_SECONDS = 3600
+
+class ActiveSessionMap(OrderedDict):
+    """CallSid -> session map that drops the least recently stored sessions once full or stale"""
+    
+    def __setitem__(self, call_sid: str, session: CallSession):
+        super().__setitem__(call_sid, session)
+        self.move_to_end(call_sid)
+        cutoff = datetime.utcnow() - timedelta(seconds=ACTIVE_SESSION_MAX_AGE_SECONDS)
+        while len(self) > 1:
+            oldest_sid, oldest = next(iter(self.items()))
+            if oldest_sid == call_sid:
+                break
+            if len(self) <= ACTIVE_SESSION_MAX and (oldest.started_at is None or oldest.started_at > cutoff):
+                break
+            self.popitem(last=False)
+
 # Store active conversation states
-active_sessions: Dict[str, CallSession] = {}
+active_sessions: Dict[str, CallSession] = ActiveSessionMap()
+
+# Recently looked-up sessions by CallSid (e.g. ringing/initiated callbacks before the call
+# is active); entries are trusted only briefly since another worker may update the session.
+LOCAL_SESSION_CACHE_SIZE = 1024
+LOCAL_SESSION_FRESH_SECONDS = 5.0
+_recent_sessions: "OrderedDict[str, Tuple[float, CallSession]]" = OrderedDict()
 
-# Initialize services
-voice_processor = VoiceProcessor()
-hybrid_tts = HybridTTSService()
+def _remember_session(session: CallSession):
+    """Record a session in the process-local LRU"""
+    call_sid = session.twilio_call_sid
+    if not call_sid:
+        return
+    _recent_sessions[call_sid] = (time.monotonic(), session)
+    _recent_sessions.move_to_end(call_sid)
+    while len(_recent_sessions) > LOCAL_SESSION_CACHE_SIZE:
+        _recent_sessions.popitem(last=False)
+
+def _get_recent_session(call_sid: str) -> Optional[CallSession]:
+    """Return a session from the process-local LRU if it is still fresh"""
+    entry = _recent_sessions.get(call_sid)
+    if not entry:
+        return None
+    stamp, session = entry
+    if time.monotonic() - stamp > LOCAL_SESSION_FRESH_SECONDS:
+        del _recent_sessions[call_sid]
+        return None
+    _recent_sessions.move_to_end(call_sid)
+    return session
 
-# Emergency fallback greeting
-def create_emergency_greeting_twiml(client_name: str = "there") -> str:
+# Session UUIDs drawn from one urandom read per batch instead of one read per call
+UUID_POOL_SIZE = 256
+_uuid_pool: List[uuid.UUID] = []
+
+def _next_uuid() -> uuid.UUID:
+    """Return a random (version 4) UUID from the pre-generated pool"""
+    if not _uuid_pool:
+        buf = os.urandom(16 * UUID_POOL_SIZE)
+        _uuid_pool.extend(uuid.UUID(bytes=buf[i:i + 16], version=4) for i in range(0, len(buf), 16))
+    return _uuid_pool.pop()
+
+# Gather action for speech input, shared by every prompt we return
+SPEECH_ACTION_URL = "/twilio/process-speech"
+SPEECH_ACTION_URL_BYTES = SPEECH_ACTION_URL.encode("utf-8")
+
+# Post-response persistence (turn appends, client updates) shares a bounded pool so a burst of
+# completed turns can't open an unbounded number of Redis/Mongo operations at once
+BACKGROUND_WRITE_CONCURRENCY = 16
+_background_write_semaphore = asyncio.Semaphore(BACKGROUND_WRITE_CONCURRENCY)
+
+async def run_background_write(func, *args):
+    """Run a post-response write while holding a background write slot"""
+    async with _background_write_semaphore:
+        await func(*args)
+
+# Emergency fallback greeting; cached per name so the outage path renders each variant once
+@lru_cache(maxsize=256)
+def create_emergency_greeting_twiml(client_name: str = "there") -> bytes:
     """Create emergency greeting TwiML when services fail"""
     return f'''<?xml version="1.0" encoding="UTF-8"?>
 <Response>
-    <Say voice="Polly.Joanna">Hello {client_name}, this is Alex from Altruis Advisor Group. We're experiencing technical difficulties. Please call us back later. Thank you.</Say>
+    <Say voice="Polly.Joanna">Hello {xml_escape(client_name)}, this is Alex from Altruis Advisor Group. We're experiencing technical difficulties. Please call us back later. Thank you.</Say>
     <Hangup/>
-</Response>'''
+</Response>'''.encode("utf-8")
 
 async def get_client_repo():
     """Get client repository with initialization"""
@@ -73,28 +151,84 @@ async def get_session_repo():
         logger.error(f"Failed to get session repo: {e}")
         return None
 
+# Clients resolved at answer time, reused by the completion path of the same call
+CLIENT_CACHE_SIZE = 5000
+CLIENT_CACHE_TTL_SECONDS = 300.0
+_clients_by_phone: "OrderedDict[str, Tuple[float, Client]]" = OrderedDict()
+
 async def get_client_by_phone(phone: str) -> Optional[Client]:
     """Get client by phone with error handling"""
+    entry = _clients_by_phone.get(phone)
+    if entry and time.monotonic() - entry[0] < CLIENT_CACHE_TTL_SECONDS:
+        _clients_by_phone.move_to_end(phone)
+        return entry[1]
+    
     try:
         client_repo = await get_client_repo()
         if client_repo:
-            return await client_repo.get_client_by_phone(phone)
+            client = await client_repo.get_client_by_phone(phone)
+            # Misses aren't cached so a client imported mid-call is found on the next lookup
+            if client:
+                _clients_by_phone[phone] = (time.monotonic(), client)
+                _clients_by_phone.move_to_end(phone)
+                while len(_clients_by_phone) > CLIENT_CACHE_SIZE:
+                    _clients_by_phone.popitem(last=False)
+            return client
         return None
     except Exception as e:
         logger.error(f"Failed to get client by phone {phone}: {e}")
         return None
 
 
+def _can_cache_session(session: CallSession) -> bool:
+    """Ensure the session has a twilio_call_sid before it is persisted"""
+    # Ensure twilio_call_sid is set (was causing duplicate key errors)
+    if not session.twilio_call_sid and hasattr(session, 'CallSid'):
+        session.twilio_call_sid = session.CallSid
+    
+    # Additional validation to prevent null twilio_call_sid
+    if not session.twilio_call_sid:
+        logger.error(f"❌ Cannot cache session {session.session_id}: twilio_call_sid is None")
+        return False
+    return True
+
+async def _save_session_to_db(session: CallSession):
+    """Save session to database, handling duplicate key errors"""
+    session_repo = await get_session_repo()
+    if session_repo:
+        try:
+            await session_repo.save_session(session)
+            logger.info(f"✅ Session saved to database: {session.session_id}")
+        except Exception as e:
+            if "duplicate key" in str(e):
+                # Try to update instead
+                logger.warning(f"⚠️ Duplicate key, attempting update: {e}")
+                from shared.utils.database import db_client
+                if db_client is not None and db_client.database is not None:
+                    # Try by session_id first, then by twilio_call_sid
+                    try:
+                        await db_client.database.call_sessions.replace_one(
+                            {"session_id": session.session_id},
+                            session.dict(by_alias=True),
+                            upsert=True
+                        )
+                        logger.info(f"✅ Session updated via upsert: {session.session_id}")
+                    except Exception as upsert_error:
+                        logger.error(f"❌ Upsert failed: {upsert_error}")
+                        # Try to delete and re-insert
+                        try:
+                            await db_client.database.call_sessions.delete_one({"twilio_call_sid": session.twilio_call_sid})
+                            await session_repo.save_session(session)
+                            logger.info(f"✅ Session re-saved after cleanup: {session.session_id}")
+                        except Exception as cleanup_error:
+                            logger.error(f"❌ Cleanup failed: {cleanup_error}")
+            else:
+                logger.error(f"❌ Failed to save session to database: {e}")
+
 async def cache_session(session: CallSession):
     """Cache session with proper twilio_call_sid setting"""
     try:
-        # Ensure twilio_call_sid is set (was causing duplicate key errors)
-        if not session.twilio_call_sid and hasattr(session, 'CallSid'):
-            session.twilio_call_sid = session.CallSid
-        
-        # Additional validation to prevent null twilio_call_sid
-        if not session.twilio_call_sid:
-            logger.error(f"❌ Cannot cache session {session.session_id}: twilio_call_sid is None")
+        if not _can_cache_session(session):
             return
         
         # Try Redis cache first
@@ -104,58 +238,130 @@ async def cache_session(session: CallSession):
             logger.info(f"✅ Session cached in Redis: {session.session_id} (twilio_call_sid: {session.twilio_call_sid})")
         
         # Also save to database - but handle duplicate key errors
-        session_repo = await get_session_repo()
-        if session_repo:
-            try:
-                # Ensure twilio_call_sid is properly set
-                if not session.twilio_call_sid:
-                    logger.warning(f"⚠️ Session {session.session_id} has no twilio_call_sid")
-                    return
-                
-                await session_repo.save_session(session)
-                logger.info(f"✅ Session saved to database: {session.session_id}")
-            except Exception as e:
-                if "duplicate key" in str(e):
-                    # Try to update instead
-                    logger.warning(f"⚠️ Duplicate key, attempting update: {e}")
-                    from shared.utils.database import db_client
-                    if db_client is not None and db_client.database is not None:
-                        # Try by session_id first, then by twilio_call_sid
-                        try:
-                            await db_client.database.call_sessions.replace_one(
-                                {"session_id": session.session_id},
-                                session.dict(by_alias=True),
-                                upsert=True
-                            )
-                            logger.info(f"✅ Session updated via upsert: {session.session_id}")
-                        except Exception as upsert_error:
-                            logger.error(f"❌ Upsert failed: {upsert_error}")
-                            # Try to delete and re-insert
-                            try:
-                                await db_client.database.call_sessions.delete_one({"twilio_call_sid": session.twilio_call_sid})
-                                await session_repo.save_session(session)
-                                logger.info(f"✅ Session re-saved after cleanup: {session.session_id}")
-                            except Exception as cleanup_error:
-                                logger.error(f"❌ Cleanup failed: {cleanup_error}")
-                else:
-                    logger.error(f"❌ Failed to save session to database: {e}")
+        await _save_session_to_db(session)
     except Exception as e:
         logger.error(f"❌ Failed to cache session: {e}")
 
+# Write-behind session cache: rapid successive writes for the same session within
+# the debounce window collapse into one, and the batch goes to Redis in one pipeline.
+CACHE_WRITE_DEBOUNCE_SECONDS = 0.02
+_pending_session_writes: Dict[str, CallSession] = {}
+# Fields touched per pending session; None means the whole document must be written
+_pending_session_fields: Dict[str, Optional[Set[str]]] = {}
+
+# Fields a speech turn changes (the turn itself is appended to a Redis list)
+TURN_UPDATE_FIELDS = {"conversation_stage", "current_turn_number", "final_outcome", "no_speech_count"}
+_pending_write_event: Optional[asyncio.Event] = None
+_cache_writer_task: Optional[asyncio.Task] = None
+
+# Latest in-flight database write per session; each write waits for the previous one so an
+# older snapshot can never land after a newer one
+_session_db_writes: Dict[str, asyncio.Task] = {}
+
+async def _write_session_to_db(session: CallSession, previous: Optional[asyncio.Task]):
+    if previous is not None:
+        await asyncio.gather(previous, return_exceptions=True)
+    await run_background_write(_save_session_to_db, session)
+
+def _schedule_session_db_write(session: CallSession):
+    """Persist a session to the database in the background, in order per session"""
+    session_id = session.session_id
+    task = asyncio.create_task(_write_session_to_db(session, _session_db_writes.get(session_id)))
+    _session_db_writes[session_id] = task
+    
+    def _done(t: asyncio.Task):
+        if _session_db_writes.get(session_id) is t:
+            del _session_db_writes[session_id]
+    task.add_done_callback(_done)
+
+async def wait_for_session_db_write(session_id: str):
+    """Wait for any background database write of this session to finish"""
+    task = _session_db_writes.get(session_id)
+    if task is not None:
+        await asyncio.gather(task, return_exceptions=True)
+
+async def _flush_session_writes():
+    """Persist all pending session writes"""
+    if not _pending_session_writes:
+        return
+    batch = [s for s in _pending_session_writes.values() if _can_cache_session(s)]
+    fields_by_session = dict(_pending_session_fields)
+    _pending_session_writes.clear()
+    _pending_session_fields.clear()
+    if not batch:
+        return
+    
+    full_writes = [s for s in batch if fields_by_session.get(s.session_id) is None]
+    field_writes = [(s, fields_by_session[s.session_id]) for s in batch if fields_by_session.get(s.session_id) is not None]
+    
+    try:
+        from shared.utils.redis_client import session_cache
+        if session_cache and session_cache.redis.is_connected():
+            if full_writes:
+                await session_cache.save_sessions(full_writes)
+            if field_writes:
+                await session_cache.save_session_fields(field_writes)
+        # Whole-document writes also go to the database, without holding up the next flush;
+        # per-turn deltas stay in Redis until the call completes (or the process shuts down)
+        for session in full_writes:
+            _schedule_session_db_write(session)
+        logger.info(f"✅ Flushed {len(batch)} session write(s)")
+    except Exception as e:
+        logger.error(f"❌ Failed to flush session writes: {e}")
+
+async def _session_cache_writer():
+    """Background task that drains pending session writes"""
+    while True:
+        await _pending_write_event.wait()
+        await asyncio.sleep(CACHE_WRITE_DEBOUNCE_SECONDS)
+        _pending_write_event.clear()
+        await _flush_session_writes()
+
+def schedule_cache_write(session: CallSession, fields: Optional[Set[str]] = None):
+    """Queue a session write; a newer write for the same session replaces the pending one.
+    Pass `fields` to write only those fields instead of the whole document."""
+    global _pending_write_event, _cache_writer_task
+    
+    _remember_session(session)
+    session_id = session.session_id
+    if session_id in _pending_session_writes:
+        pending_fields = _pending_session_fields.get(session_id)
+        fields = None if pending_fields is None or fields is None else pending_fields | fields
+    _pending_session_writes[session_id] = session
+    _pending_session_fields[session_id] = set(fields) if fields is not None else None
+    if _cache_writer_task is None or _cache_writer_task.done():
+        _pending_write_event = asyncio.Event()
+        _cache_writer_task = asyncio.create_task(_session_cache_writer())
+    _pending_write_event.set()
+
+async def flush_pending_session_writes():
+    """Flush queued session writes immediately (used on shutdown)"""
+    await _flush_session_writes()
+    # Calls still in progress have only written their per-turn deltas to Redis
+    for session in list(active_sessions.values()):
+        if _can_cache_session(session):
+            _schedule_session_db_write(session)
+    if _session_db_writes:
+        await asyncio.gather(*list(_session_db_writes.values()), return_exceptions=True)
+
 async def get_cached_session(call_sid: str) -> Optional[CallSession]:
-    """Get cached session with fallback to database"""
+    """Get cached session, checking this process before Redis and the database"""
     try:
-        # Try cache first
+        # Try active sessions and recently seen sessions in this process first
+        if call_sid in active_sessions:
+            return active_sessions[call_sid]
+        session = _get_recent_session(call_sid)
+        if session:
+            return session
+        
+        # Then the Redis cache
         from shared.utils.redis_client import session_cache
         if session_cache:
-            session = await session_cache.get_session(call_sid)
+            session = await session_cache.get_session_by_call_sid(call_sid)
             if session:
+                _remember_session(session)
                 return session
         
-        # Try active sessions
-        if call_sid in active_sessions:
-            return active_sessions[call_sid]
-        
         # Try database
         session_repo = await get_session_repo()
         if session_repo:
@@ -164,66 +370,113 @@ async def get_cached_session(call_sid: str) -> Optional[CallSession]:
             if db_client is not None and db_client.database is not None:
                 doc = await db_client.database.call_sessions.find_one({"twilio_call_sid": call_sid})
                 if doc:
-                    return CallSession(**doc)
+                    session = CallSession(**doc)
+                    _remember_session(session)
+                    return session
         
         return None
     except Exception as e:
         logger.error(f"Failed to get cached session: {e}")
         return None
 
+async def load_call_session(call_sid: str) -> Optional[CallSession]:
+    """Load the authoritative session for a call that may have been served by other workers.
+    Redis is the source of truth; the in-process copy is used when it holds writes Redis
+    hasn't seen yet or when Redis is unavailable."""
+    local = active_sessions.get(call_sid)
+    if local and local.session_id in _pending_session_writes:
+        return local
+    
+    session = None
+    try:
+        from shared.utils.redis_client import session_cache
+        if session_cache and session_cache.redis.is_connected():
+            session = await session_cache.get_session_by_call_sid(call_sid)
+    except Exception as e:
+        logger.warning(f"⚠️ Redis session load failed for {call_sid}: {e}")
+    
+    if session is None:
+        session = local or await get_cached_session(call_sid)
+    if session:
+        active_sessions[call_sid] = session
+        _remember_session(session)
+    return session
+
+# Default-name emergency greeting, rendered at import so the first failure costs nothing
+EMERGENCY_GREETING_TWIML = create_emergency_greeting_twiml()
+
+# Constant acknowledgement for non in-progress voice callbacks, encoded once at import
+CALL_RECEIVED_TWIML = create_simple_twiml("Call received.")
+
+# Precompiled TwiML for audio playback; only the audio URL and gather action are substituted
+PLAY_HANGUP_TWIML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Play>%b</Play>
+    <Pause length="1"/>
+    <Hangup/>
+</Response>"""
+
+PLAY_GATHER_TWIML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Play>%b</Play>
+    <Gather action="%b" method="POST" input="speech" timeout="8" speechTimeout="auto" enhanced="true">
+        <Pause length="1"/>
+    </Gather>
+    <Say voice="Polly.Joanna">I didn't catch that. Could you please repeat your response?</Say>
+    <Pause length="2"/>
+    <Say voice="Polly.Joanna">Thank you for calling. Goodbye.</Say>
+    <Hangup/>
+</Response>"""
+
+PLAY_TWIML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Play>%b</Play>
+</Response>"""
+
 async def create_hybrid_twiml_response(
     response_type: str, 
     text: Optional[str] = None,
     client_data: Optional[Dict[str, Any]] = None,
-    gather_action: str = "/twilio/process-speech",
+    gather_action: str = SPEECH_ACTION_URL,
     should_hangup: bool = False,
-    should_gather: bool = True
+    should_gather: bool = True,
+    session_id: Optional[str] = None,
+    tts_result: Optional[Dict[str, Any]] = None
 ) -> Response:
     """Create TwiML response using hybrid TTS service for optimal performance"""
     
     try:
-        logger.info(f"🎵 Creating hybrid TwiML for: {response_type}")
+        logger.info("🎵 Creating hybrid TwiML for: %s", response_type)
         
-        # Get audio using hybrid TTS service
-        tts_result = await hybrid_tts.get_response_audio(
-            text=text or "",
-            response_type=response_type,
-            client_data=client_data
-        )
+        # Use audio rendered ahead of time (at dial time or during the previous turn), else generate it now
+        if not tts_result:
+            tts_result = await get_prewarmed_audio(session_id, response_type)
+        if tts_result:
+            logger.info("⚡ Using prewarmed audio for: %s", response_type)
+        else:
+            tts_result = await hybrid_tts.get_response_audio(
+                text=text or "",
+                response_type=response_type,
+                client_data=client_data
+            )
         
         if tts_result.get("success") and tts_result.get("audio_url"):
             audio_url = tts_result["audio_url"]
             audio_type = tts_result.get("type", "unknown")
             generation_time = tts_result.get("generation_time_ms", 0)
             
-            logger.info(f"✅ Hybrid audio ready: {audio_type} in {generation_time}ms")
+            logger.info("✅ Hybrid audio ready: %s in %sms", audio_type, generation_time)
             
             # Build TwiML based on requirements
+            audio_url_bytes = audio_url.encode("utf-8")
             if should_hangup:
-                twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Play>{audio_url}</Play>
-    <Pause length="1"/>
-    <Hangup/>
-</Response>"""
+                twiml = PLAY_HANGUP_TWIML % audio_url_bytes
             elif should_gather:
-                twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Play>{audio_url}</Play>
-    <Gather action="{gather_action}" method="POST" input="speech" timeout="8" speechTimeout="auto" enhanced="true">
-        <Pause length="1"/>
-    </Gather>
-    <Say voice="Polly.Joanna">I didn't catch that. Could you please repeat your response?</Say>
-    <Pause length="2"/>
-    <Say voice="Polly.Joanna">Thank you for calling. Goodbye.</Say>
-    <Hangup/>
-</Response>"""
+                gather_action_bytes = SPEECH_ACTION_URL_BYTES if gather_action == SPEECH_ACTION_URL else gather_action.encode("utf-8")
+                twiml = PLAY_GATHER_TWIML % (audio_url_bytes, gather_action_bytes)
             else:
                 # No gather, just play and continue
-                twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Play>{audio_url}</Play>
-</Response>"""
+                twiml = PLAY_TWIML % audio_url_bytes
             
             return Response(content=twiml, media_type="application/xml")
         
@@ -232,11 +485,7 @@ async def create_hybrid_twiml_response(
         client_name = client_data.get("client_name", "there") if client_data else "there"
         
         if should_hangup:
-            fallback_twiml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Say voice="Polly.Joanna">Thank you for your time, {client_name}. Have a wonderful day!</Say>
-    <Hangup/>
-</Response>"""
+            fallback_twiml = create_hangup_twiml(f"Thank you for your time, {client_name}. Have a wonderful day!")
         else:
             fallback_twiml = create_emergency_greeting_twiml(client_name)
         
@@ -244,150 +493,256 @@ async def create_hybrid_twiml_response(
         
     except Exception as e:
         logger.error(f"❌ Hybrid TwiML generation error: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         
         # Emergency fallback
         client_name = client_data.get("client_name", "there") if client_data else "there"
         return Response(content=create_emergency_greeting_twiml(client_name), media_type="application/xml")
 
-@router.post("/voice")
-async def voice_webhook(
-    request: Request,
-    CallSid: str = Form(...),
-    CallStatus: Optional[str] = Form(None),
-    From: Optional[str] = Form(None),
-    To: Optional[str] = Form(None),
-    Direction: Optional[str] = Form(None),
-    is_test_call: Optional[str] = Form(None)
-):
+# Answered calls by CallSid, so a retried /voice delivery reuses the greeting it already got.
+# Both maps are in insertion (time) order and pruned once entries leave the retry window, since
+# the status callback that would clear them may go to another worker or never arrive.
+VOICE_RETRY_WINDOW_SECONDS = 15.0
+_voice_call_locks: "OrderedDict[str, Tuple[float, asyncio.Lock]]" = OrderedDict()
+_answered_calls: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+def _prune_voice_call_state(now: float):
+    """Drop retry locks and replay greetings older than the retry window"""
+    while _answered_calls:
+        answered_at, _ = next(iter(_answered_calls.values()))
+        if now - answered_at < VOICE_RETRY_WINDOW_SECONDS:
+            break
+        _answered_calls.popitem(last=False)
+    while _voice_call_locks:
+        call_sid, (created_at, lock) = next(iter(_voice_call_locks.items()))
+        if now - created_at < VOICE_RETRY_WINDOW_SECONDS:
+            break
+        if lock.locked():
+            # Still answering; check again later
+            _voice_call_locks[call_sid] = (now, lock)
+            _voice_call_locks.move_to_end(call_sid)
+            continue
+        _voice_call_locks.popitem(last=False)
+
+def _voice_call_lock(call_sid: str) -> asyncio.Lock:
+    """Per-call lock serializing /voice deliveries for the same CallSid"""
+    now = time.monotonic()
+    _prune_voice_call_state(now)
+    entry = _voice_call_locks.get(call_sid)
+    if entry is None:
+        entry = _voice_call_locks[call_sid] = (now, asyncio.Lock())
+    return entry[1]
+
+@router.post("/voice", response_class=Response)
+async def voice_webhook(request: Request):
     """Handle incoming voice calls with complete AAG conversation flow"""
     
-    logger.info(f"📞 Voice webhook: {CallSid} - Status: {CallStatus} - From: {From} - To: {To} - Direction: {Direction} - is_test_call: {is_test_call}")
+    # Parse Twilio's form body once instead of validating each field separately
+    form_data = await request.form()
+    CallSid = form_data.get("CallSid")
+    if not CallSid:
+        raise HTTPException(status_code=400, detail="CallSid is required")
+    call_status = form_data.get("CallStatus")
+    From = form_data.get("From")
+    
+    logger.info("📞 Voice webhook: %s - Status: %s - From: %s", CallSid, call_status, From)
+    
+    # Only the answered call needs a session and greeting; everything else is a constant acknowledgement
+    if call_status != "in-progress":
+        return Response(content=CALL_RECEIVED_TWIML, media_type="application/xml")
     
+    # A Twilio retry waits for the first delivery and replays its greeting instead of answering twice
+    async with _voice_call_lock(CallSid):
+        answered = _answered_calls.get(CallSid)
+        if answered and time.monotonic() - answered[0] < VOICE_RETRY_WINDOW_SECONDS:
+            logger.info("♻️ Replaying greeting for retried voice webhook: %s", CallSid)
+            return Response(content=answered[1], media_type="application/xml")
+        
+        response = await _answer_call(form_data, CallSid, From)
+        _answered_calls[CallSid] = (time.monotonic(), response.body)
+        _answered_calls.move_to_end(CallSid)
+        return response
+
+async def _answer_call(form_data, CallSid: str, From: Optional[str]) -> Response:
+    """Look up the client, start or resume the session and return the greeting"""
     try:
-        if CallStatus == "in-progress":
-            # Determine client phone based on call direction
-            client_phone = To if Direction == "outbound-api" else From
-            logger.info(f"🔍 Looking up client by phone: {client_phone}")
-            form_data = await request.form()
+        # Read the clock once and reuse it for every timestamp on this request
+        now = datetime.utcnow()
+        
+        # Dumping the whole form allocates a dict per call; only worth it when debugging
+        if settings.debug:
             logger.info(f"All form data: {dict(form_data)}")
-            
-            # Initialize client data with defaults
+        is_test_call = form_data.get("is_test_call")
+        
+        # Determine client phone based on call direction
+        client_phone = form_data.get("To") if form_data.get("Direction") == "outbound-api" else From
+        logger.info("🔍 Looking up client by phone: %s", client_phone)
+        
+        # Initialize client data with defaults
+        client_data = {
+            "client_name": "there",
+            "first_name": "there",
+            "agent_name": "your agent",
+            "last_agent": "your agent"
+        }
+        
+        # Try to get client from database
+        client = await get_client_by_phone(client_phone)
+        if client:
             client_data = {
-                "client_name": "there",
-                "first_name": "there",
-                "agent_name": "your agent",
-                "last_agent": "your agent"
+                "client_name": client.client.first_name,
+                "first_name": client.client.first_name,
+                "agent_name": client.client.last_agent or "your agent",
+                "last_agent": client.client.last_agent or "your agent"
             }
-            
-            # Try to get client from database
-            client = await get_client_by_phone(client_phone)
-            if client:
-                client_data = {
-                    "client_name": client.client.first_name,
-                    "first_name": client.client.first_name,
-                    "agent_name": client.client.last_agent or "your agent",
-                    "last_agent": client.client.last_agent or "your agent"
-                }
-                logger.info(f"✅ Found client: {client.client.first_name} (Agent: {client.client.last_agent})")
-            else:
-                logger.warning(f"⚠️ Client not found for phone: {client_phone}")
-            
-            # Check if there's already a cached session for this call (e.g., from test call creation)
-            cached_session = await get_cached_session(CallSid)
-            
-            if cached_session:
-                # Use the cached session and update it
-                session = cached_session
-                session.call_status = CallStatusEnum.IN_PROGRESS
-                session.answered_at = datetime.utcnow()
-                session.conversation_stage = ConversationStage.GREETING
-                logger.info(f"✅ Using cached session for {CallSid}, is_test_call: {session.is_test_call}")
-            else:
-                # Create new session
-                session = CallSession(
-                    session_id=str(uuid.uuid4()),
-                    twilio_call_sid=CallSid,
-                    client_id=str(client.id) if client else "unknown",
-                    phone_number=client_phone,
-                    lyzr_agent_id=settings.lyzr_conversation_agent_id,
-                    lyzr_session_id=f"voice-{CallSid}-{uuid.uuid4().hex[:8]}",
-                    client_data=client_data,
-                    is_test_call=(is_test_call == "true") or (client_phone.startswith("+1555") if client_phone else False)
-                )
-                
-                # Set initial session state
-                session.no_speech_count = 0
-                session.call_status = CallStatusEnum.IN_PROGRESS
-                session.answered_at = datetime.utcnow()
-                session.conversation_stage = ConversationStage.GREETING
-            
-            # Store session
-            active_sessions[CallSid] = session
-            await cache_session(session)
-            
-            # Start LYZR conversation session if configured
-            if lyzr_client.is_configured():
-                try:
-                    await lyzr_client.start_conversation(
-                        client_name=client_data["first_name"],
-                        phone_number=client_phone
-                    )
-                    logger.info(f"🤖 LYZR session started for {CallSid}")
-                except Exception as e:
-                    logger.warning(f"⚠️ LYZR session start failed: {e}")
-            
-            # Return greeting using hybrid TTS
-            return await create_hybrid_twiml_response(
-                response_type="greeting",
+            logger.info("✅ Found client: %s (Agent: %s)", client.client.first_name, client.client.last_agent)
+        else:
+            logger.warning(f"⚠️ Client not found for phone: {client_phone}")
+        
+        # Check if there's already a cached session for this call (e.g., from test call creation)
+        cached_session = await get_cached_session(CallSid)
+        
+        if cached_session:
+            # Use the cached session and update it
+            session = cached_session
+            session.call_status = CallStatusEnum.IN_PROGRESS
+            session.answered_at = now
+            session.conversation_stage = ConversationStage.GREETING
+            session_fields = {"call_status", "answered_at", "conversation_stage"}
+            logger.info("✅ Using cached session for %s, is_test_call: %s", CallSid, session.is_test_call)
+        else:
+            # Create new session; both ids are derived from a single UUID
+            session_uuid = _next_uuid()
+            # Every field here is built by us, so skip Pydantic validation on the answer path
+            session = CallSession.model_construct(
+                session_id=str(session_uuid),
+                twilio_call_sid=CallSid,
+                client_id=str(client.id) if client else "unknown",
+                phone_number=client_phone,
+                lyzr_agent_id=settings.lyzr_conversation_agent_id,
+                lyzr_session_id=f"voice-{CallSid}-{session_uuid.hex[:8]}",
                 client_data=client_data,
-                gather_action="/twilio/process-speech"
+                is_test_call=(is_test_call == "true") or (client_phone.startswith("+1555") if client_phone else False)
             )
+            
+            # Set initial session state
+            session.no_speech_count = 0
+            session.call_status = CallStatusEnum.IN_PROGRESS
+            session.answered_at = now
+            session.conversation_stage = ConversationStage.GREETING
+            session_fields = None
         
-        # For other statuses, just acknowledge
-        return Response(
-            content=create_simple_twiml("Call received."),
-            media_type="application/xml"
+        # Store session
+        active_sessions[CallSid] = session
+        schedule_cache_write(session, fields=session_fields)
+        
+        # Start LYZR conversation session if configured
+        if lyzr_client.is_configured():
+            try:
+                await lyzr_client.start_conversation(
+                    client_name=client_data["first_name"],
+                    phone_number=client_phone
+                )
+                logger.info("🤖 LYZR session started for %s", CallSid)
+            except Exception as e:
+                logger.warning(f"⚠️ LYZR session start failed: {e}")
+        
+        # Prepare the likely answers to the greeting while it plays
+        schedule_tts_prewarm(session)
+        
+        # Return greeting using hybrid TTS, reusing the audio rendered when the call was dialed
+        return await create_hybrid_twiml_response(
+            response_type="greeting",
+            client_data=client_data,
+            gather_action=SPEECH_ACTION_URL,
+            tts_result=await get_prewarmed_audio(CallSid, "greeting")
         )
         
     except Exception as e:
         logger.error(f"❌ Voice webhook error: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         
         # Return emergency fallback
         return Response(
-            content=create_emergency_greeting_twiml(),
+            content=EMERGENCY_GREETING_TWIML,
             media_type="application/xml"
         )
 
 
-@router.post("/process-speech")
-async def process_speech_webhook(
+# Duplicate speech webhook deliveries share a lock and reuse the first delivery's TwiML
+SPEECH_LOCK_TTL_SECONDS = 30
+SPEECH_TWIML_TTL_SECONDS = 60
+SPEECH_DUPLICATE_WAIT_SECONDS = 5.0
+
+def _speech_delivery_key(call_sid: str, idempotency_token: Optional[str]) -> Optional[str]:
+    """Key shared by redeliveries of one webhook (Twilio repeats the idempotency token on retries)"""
+    if not idempotency_token:
+        return None
+    return f"{call_sid}:{idempotency_token}"
+
+@router.post("/process-speech", response_class=Response)
+async def process_speech_webhook(request: Request):
+    """Process customer speech, coalescing duplicate Twilio deliveries"""
+    
+    # Parse Twilio's form body once instead of validating each field separately
+    form_data = await request.form()
+    CallSid = form_data.get("CallSid")
+    if not CallSid:
+        raise HTTPException(status_code=400, detail="CallSid is required")
+    SpeechResult = form_data.get("SpeechResult")
+    UnstableSpeechResult = form_data.get("UnstableSpeechResult")
+    try:
+        Confidence = float(form_data["Confidence"]) if form_data.get("Confidence") else None
+    except ValueError:
+        Confidence = None
+    
+    # Same words on a later turn ("yes", then "yes") are a new delivery, so key on the
+    # per-delivery idempotency token rather than the speech text
+    delivery_key = _speech_delivery_key(CallSid, request.headers.get("I-Twilio-Idempotency-Token"))
+    if not delivery_key or not redis_client.is_connected():
+        return await _handle_speech(request, CallSid, SpeechResult, Confidence, UnstableSpeechResult)
+    
+    lock_key = f"lock:speech:{delivery_key}"
+    twiml_key = f"twiml:speech:{delivery_key}"
+    
+    if not await redis_client.set_nx(lock_key, "1", ttl=SPEECH_LOCK_TTL_SECONDS):
+        # Another delivery of this webhook is (or was) being processed - wait for its TwiML
+        logger.warning(f"⚠️ Duplicate speech webhook for {CallSid}, reusing first response")
+        deadline = time.monotonic() + SPEECH_DUPLICATE_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            cached_twiml = await redis_client.get(twiml_key)
+            if cached_twiml:
+                return Response(content=cached_twiml, media_type="application/xml")
+            await asyncio.sleep(0.1)
+        logger.warning(f"⚠️ First delivery for {CallSid} produced no TwiML in time, processing again")
+    
+    response = await _handle_speech(request, CallSid, SpeechResult, Confidence, UnstableSpeechResult)
+    
+    # Cache the TwiML for redeliveries once the response has gone out
+    if response.background is None:
+        response.background = BackgroundTasks()
+    response.background.add_task(redis_client.set, twiml_key, response.body.decode("utf-8"), ttl=SPEECH_TWIML_TTL_SECONDS)
+    return response
+
+async def _handle_speech(
     request: Request,
-    CallSid: str = Form(...),
-    SpeechResult: Optional[str] = Form(None),
-    Confidence: Optional[float] = Form(None),
-    UnstableSpeechResult: Optional[str] = Form(None)
-):
+    CallSid: str,
+    SpeechResult: Optional[str],
+    Confidence: Optional[float],
+    UnstableSpeechResult: Optional[str]
+) -> Response:
     """Process customer speech with complete conversation handling"""
     
     # Use UnstableSpeechResult if SpeechResult is empty for better responsiveness
     if not SpeechResult and UnstableSpeechResult:
         SpeechResult = UnstableSpeechResult
-        logger.info(f"🎤 Using unstable speech result: '{SpeechResult}'")
+        logger.info("🎤 Using unstable speech result: '%s'", SpeechResult)
     
-    logger.info(f"🎤 Processing speech: {CallSid} - Result: '{SpeechResult}' - Confidence: {Confidence}")
+    logger.info("🎤 Processing speech: %s - Result: '%s' - Confidence: %s", CallSid, SpeechResult, Confidence)
     
     try:
-        # Get the session from active memory or fall back to cache
-        session = active_sessions.get(CallSid)
-        if not session:
-            session = await get_cached_session(CallSid)
-            if session:
-                active_sessions[CallSid] = session
-                logger.info(f"✅ Restored session from cache: {CallSid}")
+        # Another worker may have handled the previous turn, so load the shared copy
+        session = await load_call_session(CallSid)
         
         if not session:
             logger.error(f"❌ CRITICAL: Session not found for CallSid: {CallSid}. Cannot continue.")
@@ -409,7 +764,7 @@ async def process_speech_webhook(
                 logger.warning(f"⚠️ Too many no-speech attempts. Ending call {CallSid}.")
                 session.final_outcome = "no_answer"
                 session.conversation_stage = ConversationStage.GOODBYE
-                await cache_session(session)
+                schedule_cache_write(session, fields=TURN_UPDATE_FIELDS)
                 
                 return await create_hybrid_twiml_response(
                     response_type="goodbye",
@@ -421,7 +776,8 @@ async def process_speech_webhook(
                 return await create_hybrid_twiml_response(
                     response_type="clarification",
                     text="I'm sorry, I didn't catch that. Could you please say that again?",
-                    client_data=session.client_data
+                    client_data=session.client_data,
+                    session_id=session.session_id
                 )
         
         session.no_speech_count = 0
@@ -433,69 +789,79 @@ async def process_speech_webhook(
             confidence=Confidence or 0.0
         )
         
-        logger.info(f"🔄 Processing result: {process_result}")
+        logger.info("🔄 Processing result: %s", process_result)
         
         # IMPORTANT: Update session's conversation stage from the result
+        new_stage = session.conversation_stage
         new_stage_value = process_result.get("conversation_stage")
         if new_stage_value:
             try:
-                session.conversation_stage = ConversationStage(new_stage_value)
-                logger.info(f"📍 Updated session stage to: {session.conversation_stage.value}")
+                new_stage = ConversationStage(new_stage_value)
+                logger.info("📍 Updated session stage to: %s", new_stage.value)
             except ValueError:
                 logger.warning(f"⚠️ Invalid stage value: {new_stage_value}")
         
         # Create conversation turn with proper enum handling
         response_type_enum = ResponseType.HYBRID if process_result.get("lyzr_used") else ResponseType.STATIC
         
-        turn = ConversationTurn(
+        # Turn values are already typed here, so construct without re-validating them
+        turn = ConversationTurn.model_construct(
             turn_number=len(session.conversation_turns) + 1 if session.conversation_turns else 1,
             customer_speech=SpeechResult,
             customer_speech_confidence=Confidence or 0.0,
-            agent_response=process_result.get("response_text", ""),
+            agent_response=process_result.get("response_text") or "",
             response_type=response_type_enum,
-            conversation_stage=session.conversation_stage,
-            processing_time_ms=process_result.get("processing_time_ms", 0)
+            conversation_stage=new_stage,
+            processing_time_ms=int(process_result.get("processing_time_ms") or 0)
         )
+        session.record_turn(turn, new_stage)
         
-        if not session.conversation_turns:
-            session.conversation_turns = []
-        session.conversation_turns.append(turn)
-        session.current_turn_number = turn.turn_number
+        # Persist the turn after the TwiML has been sent so Twilio isn't waiting on Redis
+        turn_writes = BackgroundTasks()
+        turn_writes.add_task(run_background_write, append_session_turn, session, turn)
         
         # Update final outcome if provided
         if process_result.get("outcome"):
             session.final_outcome = process_result["outcome"]
         
-        # Save the updated session state to cache BEFORE creating response
-        await cache_session(session)
+        # Queue the updated session state; rapid follow-up writes are coalesced
+        schedule_cache_write(session, fields=TURN_UPDATE_FIELDS)
         
         # Check if the conversation should end
         if process_result.get("end_conversation", False):
-            logger.info(f"🎬 Conversation ending for {CallSid}. Outcome: {session.final_outcome}")
+            logger.info("🎬 Conversation ending for %s. Outcome: %s", CallSid, session.final_outcome)
             
             # Mark session as completed
             session.call_status = CallStatusEnum.COMPLETED
             session.complete_call(session.final_outcome)
             
             # Save final state
-            await cache_session(session)
+            schedule_cache_write(session)
             
             # Remove from active sessions (will be cleaned up in status webhook)
             # But keep it for now to track completion
             
-            return await create_hybrid_twiml_response(
+            response = await create_hybrid_twiml_response(
                 response_type=process_result.get("response_category", "goodbye"),
                 text=process_result.get("response_text"),
                 client_data=session.client_data,
-                should_hangup=True
+                should_hangup=True,
+                session_id=session.session_id
             )
         else:
+            # Prepare the likely answers to this prompt while it plays
+            schedule_tts_prewarm(session)
+            
             # Continue the conversation
-            return await create_hybrid_twiml_response(
+            response = await create_hybrid_twiml_response(
                 response_type=process_result.get("response_category", "dynamic"),
                 text=process_result.get("response_text"),
-                client_data=session.client_data
+                client_data=session.client_data,
+                session_id=session.session_id
             )
+        
+        response.background = turn_writes
+        return response
             
     except Exception as e:
         logger.error(f"❌ Unrecoverable error in speech processing for {CallSid}: {e}", exc_info=True)
@@ -616,6 +982,18 @@ async def process_speech_webhook(
 #         )
 
 
+# Session outcome -> (CRM tag, client call outcome) written when the call completes
+CLIENT_OUTCOME_UPDATES: Dict[str, Tuple[Optional[CRMTag], CallOutcome]] = {
+    "scheduled": (CRMTag.INTERESTED, CallOutcome.INTERESTED),
+    "interested": (CRMTag.INTERESTED, CallOutcome.INTERESTED),
+    "interested_no_schedule": (CRMTag.INTERESTED, CallOutcome.INTERESTED),
+    "not_interested": (CRMTag.NOT_INTERESTED, CallOutcome.NOT_INTERESTED),
+    "keep_communications": (CRMTag.NOT_INTERESTED, CallOutcome.NOT_INTERESTED),
+    "dnc_requested": (CRMTag.DNC_REQUESTED, CallOutcome.DNC_REQUESTED),
+    "no_answer": (None, CallOutcome.NO_ANSWER),
+}
+CAMPAIGN_COMPLETING_OUTCOMES = frozenset({"interested", "not_interested", "dnc_requested", "scheduled"})
+
 async def update_client_record(session: CallSession, outcome: str, client: Client):
     """Update client record with call outcome and details"""
     try:
@@ -626,30 +1004,15 @@ async def update_client_record(session: CallSession, outcome: str, client: Clien
         
         client_id = str(client.id)
         
-        # Apply CRM tags based on outcome
-        if outcome in ["scheduled", "interested", "interested_no_schedule"]:
-            await client_repo.add_crm_tag(client_id, CRMTag.INTERESTED)
-            await client_repo.update_call_outcome(client_id, CallOutcome.INTERESTED)
-            logger.info(f"✅ Client {client_id} marked as INTERESTED")
-            
-        elif outcome in ["not_interested", "keep_communications"]:
-            await client_repo.add_crm_tag(client_id, CRMTag.NOT_INTERESTED)
-            await client_repo.update_call_outcome(client_id, CallOutcome.NOT_INTERESTED)
-            logger.info(f"✅ Client {client_id} marked as NOT_INTERESTED")
-            
-        elif outcome == "dnc_requested":
-            await client_repo.add_crm_tag(client_id, CRMTag.DNC_REQUESTED)
-            await client_repo.update_call_outcome(client_id, CallOutcome.DNC_REQUESTED)
-            logger.info(f"✅ Client {client_id} marked as DNC_REQUESTED")
-            
-        elif outcome == "no_answer":
-            await client_repo.update_call_outcome(client_id, CallOutcome.NO_ANSWER)
-            logger.info(f"✅ Client {client_id} marked as NO_ANSWER")
+        # Determine CRM tag and outcome; everything is written with the call attempt below
+        crm_tag, call_outcome = CLIENT_OUTCOME_UPDATES.get(outcome, (None, None))
+        if call_outcome:
+            logger.info(f"✅ Client {client_id} marked as {call_outcome.value.upper()}")
         
         # Build call summary
         call_summary = {
             "attempt_number": client.total_attempts + 1,
-            "timestamp": datetime.utcnow(),
+            "timestamp": session.completed_at or datetime.utcnow(),
             "outcome": outcome,
             "duration_seconds": int(session.session_metrics.total_call_duration_seconds) if session.session_metrics else 0,
             "twilio_call_sid": session.twilio_call_sid,
@@ -659,20 +1022,25 @@ async def update_client_record(session: CallSession, outcome: str, client: Clien
         
         # Add transcript if available
         if session.conversation_turns:
-            transcript = build_conversation_transcript(session)
+            transcript = await get_conversation_transcript(session)
             call_summary["transcript"] = transcript
         
         # Add AI summary if available
         if hasattr(session, 'call_summary') and session.call_summary:
             call_summary["ai_summary"] = session.call_summary
         
-        # Add call attempt to history
-        await client_repo.add_call_attempt(client_id, call_summary)
-        
-        # Update campaign status if needed
-        if outcome in ["interested", "not_interested", "dnc_requested", "scheduled"]:
-            await client_repo.update_client(client_id, {"campaignStatus": "completed"})
-        
+        # Add call attempt, CRM tag, outcome and campaign status in one round-trip
+        await client_repo.record_completed_call(
+            client_id,
+            call_summary,
+            crm_tags=[crm_tag] if crm_tag else None,
+            outcome=call_outcome,
+            updates={"campaignStatus": "completed"} if outcome in CAMPAIGN_COMPLETING_OUTCOMES else None
+        )
+        # The cached snapshot no longer matches the document; the next call reloads it
+        for phone in {session.phone_number, client.client.phone}:
+            _clients_by_phone.pop(phone, None)
+
     except Exception as e:
         logger.error(f"❌ Failed to update client record: {e}")
 
@@ -684,7 +1052,7 @@ async def generate_and_save_call_summary(session: CallSession, client: Optional[
             return
         
         # Build conversation transcript
-        transcript = build_conversation_transcript(session)
+        transcript = await get_conversation_transcript(session)
         
         # Get client name
         client_name = "Unknown"
@@ -738,43 +1106,92 @@ def build_conversation_transcript(session: CallSession) -> str:
     
     return "\n".join(transcript_lines).strip()
 
+# Turn count above which transcript rebuilds are dispatched to a worker thread
+TRANSCRIPT_THREAD_THRESHOLD = 40
+
+def _format_cached_turns(entries: List[str]) -> str:
+    """Format the JSON turns from the session's Redis turn list as a transcript"""
+    turns = [orjson.loads(entry) for entry in entries]
+    return "\n\n".join(
+        f"Customer: {turn.get('customer_speech')}\nAgent: {turn.get('agent_response')}" for turn in turns
+    ).strip()
+
+async def append_session_turn(session: CallSession, turn: ConversationTurn):
+    """Append a turn to the cached session without rewriting the whole document"""
+    try:
+        from shared.utils.redis_client import session_cache
+        if session_cache:
+            await session_cache.append_turn(session.session_id, turn)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to append session turn: {e}")
+
+async def get_conversation_transcript(session: CallSession) -> str:
+    """Get the transcript from the session's cached turn list, rebuilding it if Redis is incomplete"""
+    long_call = len(session.conversation_turns) > TRANSCRIPT_THREAD_THRESHOLD
+    try:
+        from shared.utils.redis_client import session_cache
+        if session_cache:
+            entries = await session_cache.redis.lrange(f"{session_cache.session_turns_prefix}{session.session_id}")
+            if entries and len(entries) == len(session.conversation_turns):
+                if long_call:
+                    return await asyncio.to_thread(_format_cached_turns, entries)
+                return _format_cached_turns(entries)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to read transcript from Redis: {e}")
+    # Rebuilding a long call's transcript is CPU work; keep it off the event loop
+    if long_call:
+        return await asyncio.to_thread(build_conversation_transcript, session)
+    return build_conversation_transcript(session)
+
+# Twilio status callback values mapped straight to session statuses
+TWILIO_CALL_STATUS_MAP = {
+    "initiated": CallStatusEnum.INITIATED,
+    "ringing": CallStatusEnum.RINGING,
+    "in-progress": CallStatusEnum.IN_PROGRESS,
+    "completed": CallStatusEnum.COMPLETED,
+    "failed": CallStatusEnum.FAILED,
+    "busy": CallStatusEnum.BUSY,
+    "no-answer": CallStatusEnum.NO_ANSWER
+}
+TERMINAL_CALL_STATUSES = {
+    CallStatusEnum.COMPLETED,
+    CallStatusEnum.FAILED,
+    CallStatusEnum.BUSY,
+    CallStatusEnum.NO_ANSWER
+}
+
 @router.post("/status")
 async def status_webhook(
     request: Request,
+    background_tasks: BackgroundTasks,
     CallSid: str = Form(...),
-    CallStatus: str = Form(...),
+    call_status: str = Form(..., alias="CallStatus"),
     CallDuration: Optional[str] = Form(None),
     RecordingUrl: Optional[str] = Form(None)
 ):
     """Handle call status updates with proper cleanup"""
     
-    logger.info(f"📊 Status update: {CallSid} - Status: {CallStatus} - Duration: {CallDuration}")
+    logger.info("📊 Status update: %s - Status: %s - Duration: %s", CallSid, call_status, CallDuration)
     
     try:
         # Handle call completion
-        if CallStatus in ["completed", "failed", "busy", "no-answer"]:
-            # Get session from active or cache
-            session = active_sessions.get(CallSid)
-            if not session:
-                session = await get_cached_session(CallSid)
+        status_enum = TWILIO_CALL_STATUS_MAP.get(call_status)
+        if status_enum in TERMINAL_CALL_STATUSES:
+            _voice_call_locks.pop(CallSid, None)
+            _answered_calls.pop(CallSid, None)
+            
+            # The final save must start from the shared copy, not a stale local one
+            session = await load_call_session(CallSid)
             
             if session:
                 # Update call status
-                if CallStatus == "completed":
-                    session.call_status = CallStatusEnum.COMPLETED
-                elif CallStatus == "failed":
-                    session.call_status = CallStatusEnum.FAILED
-                elif CallStatus == "busy":
-                    session.call_status = CallStatusEnum.BUSY
-                elif CallStatus == "no-answer":
-                    session.call_status = CallStatusEnum.NO_ANSWER
+                session.call_status = status_enum
                 
                 # Update duration
                 if CallDuration:
                     try:
                         duration = int(CallDuration)
                         if not session.session_metrics:
-                            from shared.models.call_session import SessionMetrics
                             session.session_metrics = SessionMetrics()
                         session.session_metrics.total_call_duration_seconds = duration
                     except ValueError:
@@ -782,20 +1199,19 @@ async def status_webhook(
                 
                 # Set appropriate outcome based on status if not already set
                 if not session.final_outcome:
-                    if CallStatus == "completed":
+                    if status_enum == CallStatusEnum.COMPLETED:
                         # If completed but no outcome, check conversation stage
                         if session.conversation_stage == ConversationStage.GOODBYE:
                             session.final_outcome = "completed"
                         else:
                             session.final_outcome = "incomplete"
-                    elif CallStatus == "no-answer":
+                    elif status_enum == CallStatusEnum.NO_ANSWER:
                         session.final_outcome = "no_answer"
-                    elif CallStatus in ["busy", "failed"]:
+                    elif status_enum in (CallStatusEnum.BUSY, CallStatusEnum.FAILED):
                         session.final_outcome = "failed"
                 
                 # Complete the call
                 session.complete_call(session.final_outcome)
-                session.completed_at = datetime.utcnow()
                 
                 # Get client for summary and update
                 client = await get_client_by_phone(session.phone_number)
@@ -804,11 +1220,16 @@ async def status_webhook(
                 if session.conversation_turns and len(session.conversation_turns) > 0:
                     await generate_and_save_call_summary(session, client)
                 
-                # Update client record if we have one
+                # Update client record after the response; Twilio doesn't wait on CRM writes
                 if client and session.final_outcome:
-                    await update_client_record(session, session.final_outcome, client)
+                    background_tasks.add_task(run_background_write, update_client_record, session, session.final_outcome, client)
+                
+                # The final save below supersedes any queued write-behind update
+                _pending_session_writes.pop(session.session_id, None)
+                _pending_session_fields.pop(session.session_id, None)
                 
-                # Final save to database with all updates
+                # Final save to database with all updates, after any earlier background write
+                await wait_for_session_db_write(session.session_id)
                 session_repo = await get_session_repo()
                 if session_repo:
                     try:
@@ -848,13 +1269,14 @@ async def status_webhook(
                 from shared.utils.redis_client import session_cache
                 if session_cache:
                     try:
-                        # Remove from Redis by call SID
-                        await session_cache.delete_session(CallSid)
+                        # Remove from Redis
+                        await session_cache.delete_session(session.session_id)
                         logger.info(f"🗑️ Removed session from Redis cache: {CallSid}")
                     except Exception as e:
                         logger.warning(f"Could not remove from Redis: {e}")
                 
                 # Clean up active session
+                _recent_sessions.pop(CallSid, None)
                 if CallSid in active_sessions:
                     del active_sessions[CallSid]
                     logger.info(f"🗑️ Removed from active sessions: {CallSid}")
@@ -865,62 +1287,46 @@ async def status_webhook(
         
         # Handle other status updates (initiated, ringing, in-progress)
         else:
-            # Update session status if it exists
-            session = active_sessions.get(CallSid)
-            if not session:
-                session = await get_cached_session(CallSid)
+            # Intermediate callbacks only touch a session this process already holds;
+            # voice_webhook sets the in-progress status itself, so skip the Redis lookup
+            session = active_sessions.get(CallSid) or _get_recent_session(CallSid)
             
             if session:
-                if CallStatus == "initiated":
-                    session.call_status = CallStatusEnum.INITIATED
-                elif CallStatus == "ringing":
-                    session.call_status = CallStatusEnum.RINGING
-                elif CallStatus == "in-progress":
-                    session.call_status = CallStatusEnum.IN_PROGRESS
+                if status_enum is not None:
+                    session.call_status = status_enum
                 
                 # Save updated status
-                await cache_session(session)
-                logger.info(f"📞 Call status updated: {CallSid} -> {CallStatus}")
+                schedule_cache_write(session, fields={"call_status"})
+                logger.info("📞 Call status updated: %s -> %s", CallSid, call_status)
         
-        return {"status": "ok", "call_sid": CallSid, "call_status": CallStatus}
+        return {"status": "ok", "call_sid": CallSid, "call_status": call_status}
         
     except Exception as e:
         logger.error(f"❌ Status webhook error: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         return {"status": "error", "message": str(e)}
 
+# Service configuration rarely changes, so readiness probes reuse the last check briefly
+_connection_status_cache: Dict[str, Any] = {}
+_connection_status_timestamp: Optional[datetime] = None
+_connection_status_duration = timedelta(seconds=10)
+
 @router.get("/test-connection")
 async def test_twilio_connection():
     """Test Twilio connection and system readiness"""
+    global _connection_status_cache, _connection_status_timestamp
     
     try:
-        # Check service configurations
-        services_status = {
-            "twilio": {
-                "configured": bool(settings.twilio_account_sid and settings.twilio_auth_token),
-                "phone_number": settings.twilio_phone_number if settings.twilio_phone_number else "Not configured"
-            },
-            "hybrid_tts": {
-                "configured": await hybrid_tts.is_configured(),
-                "stats": hybrid_tts.get_performance_stats()
-            },
-            "voice_processor": {
-                "configured": voice_processor.is_configured()
-            },
-            "lyzr": {
-                "configured": lyzr_client.is_configured(),
-                "conversation_agent": settings.lyzr_conversation_agent_id,
-                "summary_agent": settings.lyzr_summary_agent_id
-            }
-        }
-        
-        # Test database connection
-        try:
-            client_repo = await get_client_repo()
-            services_status["database"] = {"connected": client_repo is not None}
-        except Exception as e:
-            services_status["database"] = {"connected": False, "error": str(e)}
+        now = datetime.utcnow()
+        if (_connection_status_timestamp and
+            now - _connection_status_timestamp < _connection_status_duration and
+            _connection_status_cache):
+            services_status = dict(_connection_status_cache)
+        else:
+            services_status = await _check_services_status()
+            _connection_status_cache = services_status
+            _connection_status_timestamp = now
+            services_status = dict(services_status)
         
         # Check active sessions
         services_status["active_sessions"] = {
@@ -942,7 +1348,7 @@ async def test_twilio_connection():
                 "voice": f"{settings.base_url}/twilio/voice",
                 "status": f"{settings.base_url}/twilio/status"
             },
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now.isoformat()
         }
         
     except Exception as e:
@@ -951,4 +1357,42 @@ async def test_twilio_connection():
             "status": "error",
             "error": str(e),
             "timestamp": datetime.utcnow().isoformat()
-        }
\ No newline at end of file
+        }
+
+async def _check_services_status() -> Dict[str, Any]:
+    """Check configuration and connectivity of the services a call depends on"""
+    
+    # The TTS and database probes are independent, so run them concurrently
+    tts_configured, client_repo = await asyncio.gather(
+        hybrid_tts.is_configured(),
+        get_client_repo(),
+        return_exceptions=True
+    )
+    
+    # Check service configurations
+    services_status = {
+        "twilio": {
+            "configured": bool(settings.twilio_account_sid and settings.twilio_auth_token),
+            "phone_number": settings.twilio_phone_number if settings.twilio_phone_number else "Not configured"
+        },
+        "hybrid_tts": {
+            "configured": tts_configured is True,
+            "stats": hybrid_tts.get_performance_stats()
+        },
+        "voice_processor": {
+            "configured": voice_processor.is_configured()
+        },
+        "lyzr": {
+            "configured": lyzr_client.is_configured(),
+            "conversation_agent": settings.lyzr_conversation_agent_id,
+            "summary_agent": settings.lyzr_summary_agent_id
+        }
+    }
+    
+    # Test database connection
+    if isinstance(client_repo, Exception):
+        services_status["database"] = {"connected": False, "error": str(client_repo)}
+    else:
+        services_status["database"] = {"connected": client_repo is not None}
+    
+    return services_status
@@ -32,12 +32,20 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Leading agent tag, e.g. "AB - Anthony Fracchia" in "AB - Anthony Fracchia, AAG - Medicare Client"
+AGENT_TAG_PATTERN = re.compile(r"AB - ([^,]+)")
+
 class ClientImporter:
     """Handles client data import with agent assignment"""
     
     def __init__(self):
         self.agents_config = self.load_agents_config()
         self.agent_tag_mapping = self.create_agent_tag_mapping()
+        self.agent_name_mapping = {
+            agent["name"]: agent for agent in self.agents_config.get("agents", []) if agent.get("name")
+        }
+        # Rows share a handful of distinct tag strings, so resolve each one only once
+        self._agent_by_tag: Dict[str, Optional[Dict[str, Any]]] = {}
         
         # Statistics
         self.imported_count = 0
@@ -78,24 +86,29 @@ class ClientImporter:
         if not tag:
             return None
         
+        if tag not in self._agent_by_tag:
+            self._agent_by_tag[tag] = self._match_agent_tag(tag)
+        return self._agent_by_tag[tag]
+    
+    def _match_agent_tag(self, tag: str) -> Optional[Dict[str, Any]]:
+        """Match a tag string to an agent"""
         # Try exact match first
         if tag in self.agent_tag_mapping:
             return self.agent_tag_mapping[tag]
         
-        # Try partial match for tags with additional info (e.g., "AB - Anthony Fracchia, AAG - Medicare Client")
+        # Extract the leading "AB - [Name]" tag once and look it up directly
+        match = AGENT_TAG_PATTERN.match(tag)
+        if match:
+            agent_name = match.group(1).strip()
+            agent_info = self.agent_tag_mapping.get(f"AB - {agent_name}") or self.agent_name_mapping.get(agent_name)
+            if agent_info:
+                return agent_info
+        
+        # Fall back to a prefix scan for identifiers that don't follow the "AB - [Name]" pattern
         for tag_identifier, agent_info in self.agent_tag_mapping.items():
             if tag.startswith(tag_identifier):
                 return agent_info
         
-        # Extract agent name using regex pattern "AB - [Name]"
-        match = re.match(r"AB - ([^,]+)", tag)
-        if match:
-            agent_name = match.group(1).strip()
-            # Try to find agent by name
-            for agent_info in self.agents_config.get("agents", []):
-                if agent_info["name"] == agent_name:
-                    return agent_info
-        
         logger.warning(f"⚠️ Could not map tag to agent: {tag}")
         return None
     
@@ -5,7 +5,7 @@ Updated to use existing audio-generation directory structure
 """
 
 import os
-import json
+import orjson
 import asyncio
 import sys
 from pathlib import Path
@@ -31,6 +31,23 @@ NAMES_DIR = OUTPUT_DIR / 'names'
 CLIENT_NAMES_DIR = NAMES_DIR / 'clients'
 AGENT_NAMES_DIR = NAMES_DIR / 'agents'
 
+# Hash of each generated segment's text and voice, so edited text or voice changes get re-synthesized
+SEGMENTS_INDEX_PATH = OUTPUT_DIR / 'segments_index.json'
+
+# Concurrent ElevenLabs requests; keep at or below your plan's limit (2 on the free tier)
+MAX_CONCURRENT_REQUESTS = int(os.getenv("ELEVENLABS_MAX_CONCURRENT", "2"))
+
+# Retry policy for rate-limited ("Too many concurrent requests"), 5xx and network failures
+MAX_RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_BACKOFF_START = 0.5
+RATE_LIMIT_BACKOFF_MAX = 16.0
+
+# Stop issuing requests after this many files fail in a row (API down, bad key, quota exhausted)
+CIRCUIT_BREAKER_THRESHOLD = 3
+
+_throttle_warned = False
+_consecutive_failures = 0
+
 # AAG Script Segments with email scheduling mentions
 SCRIPT_SEGMENTS = {
     # Main Greeting Segments
@@ -70,32 +87,61 @@ ADDITIONAL_CLIENT_NAMES = [
     "Steven", "Andrew", "Brian", "George", "Edward", "Ronald"
 ]
 
+def _existing_stems(directory: Path) -> set:
+    """Names (without extension) of the mp3 files already in a directory"""
+    if not directory.is_dir():
+        return set()
+    with os.scandir(directory) as entries:
+        return {
+            os.path.splitext(entry.name)[0]
+            for entry in entries
+            if entry.name.endswith(".mp3") and entry.is_file()
+        }
+
+def _write_json(path: Path, data: dict, option: int = orjson.OPT_INDENT_2):
+    """Write JSON to a temp file and rename it into place so a crash never leaves it half-written"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(orjson.dumps(data, option=option))
+    os.replace(tmp_path, path)
+
+def _segment_hash(text: str) -> str:
+    """Short content hash of a segment's script text and the voice it is rendered with"""
+    return elevenlabs_client.cache_key(text)[:16]
+
+def load_segment_index() -> dict:
+    """Load the segment name -> text hash index"""
+    try:
+        return orjson.loads(SEGMENTS_INDEX_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+def save_segment_index(index: dict):
+    """Write the segment index"""
+    _write_json(SEGMENTS_INDEX_PATH, index, orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+
 # Check which segments are missing
 def check_missing_segments():
-    """Check which segments need to be generated"""
-    missing_segments = []
-    existing_segments = []
+    """Check which segments need to be generated (missing file or changed text)"""
+    existing = _existing_stems(SEGMENTS_DIR)
+    index = load_segment_index()
     
-    for segment_name in SCRIPT_SEGMENTS.keys():
-        filepath = SEGMENTS_DIR / f"{segment_name}.mp3"
-        if filepath.exists():
-            existing_segments.append(segment_name)
+    existing_segments = []
+    missing_segments = []
+    for name, text in SCRIPT_SEGMENTS.items():
+        # Files from before the index existed are assumed to match their current text
+        if name in existing and index.get(name, _segment_hash(text)) == _segment_hash(text):
+            existing_segments.append(name)
         else:
-            missing_segments.append(segment_name)
+            missing_segments.append(name)
     
     return existing_segments, missing_segments
 
 # Check which names are missing
 def check_missing_names():
     """Check which names need to be generated"""
-    missing_clients = []
-    missing_agents = []
-    
     # Check client names
-    for name in ADDITIONAL_CLIENT_NAMES:
-        filepath = CLIENT_NAMES_DIR / f"{name.lower()}.mp3"
-        if not filepath.exists():
-            missing_clients.append(name)
+    existing_clients = _existing_stems(CLIENT_NAMES_DIR)
+    missing_clients = [name for name in ADDITIONAL_CLIENT_NAMES if name.lower() not in existing_clients]
     
     # You already have agent names, but check anyway
     existing_agents = ["anthony_fracchia", "hineth_pettway", "india_watson", 
@@ -103,6 +149,68 @@ def check_missing_names():
     
     return missing_clients, existing_agents
 
+def _is_retryable(result: dict) -> bool:
+    """Whether a failed request is worth retrying (rate limit, server error or network failure)"""
+    if result.get("success"):
+        return False
+    status_code = result.get("status_code")
+    return status_code is None or status_code == 429 or status_code >= 500
+
+def _retry_delay(result: dict, backoff: float) -> float:
+    """Seconds to wait before retrying a failed request"""
+    try:
+        return min(float(result.get("retry_after")), RATE_LIMIT_BACKOFF_MAX)
+    except (TypeError, ValueError):
+        return backoff
+
+async def _generate_with_retry(text: str, filepath: Path) -> dict:
+    """Stream speech into filepath, backing off and retrying transient ElevenLabs failures"""
+    global _throttle_warned
+    
+    backoff = RATE_LIMIT_BACKOFF_START
+    result = await elevenlabs_client.stream_speech_to_file(text, filepath)
+    
+    for _ in range(MAX_RATE_LIMIT_RETRIES):
+        if not _is_retryable(result):
+            break
+        
+        if result.get("status_code") == 429 and not _throttle_warned:
+            _throttle_warned = True
+            limit = result.get("maximum_concurrent_requests")
+            logger.warning(
+                f"⚠️ ElevenLabs is throttling requests (plan limit: {limit or 'unknown'} concurrent, "
+                f"ELEVENLABS_MAX_CONCURRENT={MAX_CONCURRENT_REQUESTS}); retrying with backoff"
+            )
+        
+        await asyncio.sleep(_retry_delay(result, backoff))
+        backoff = min(backoff * 2, RATE_LIMIT_BACKOFF_MAX)
+        result = await elevenlabs_client.stream_speech_to_file(text, filepath)
+    
+    return result
+
+async def _synthesize_to(label: str, text: str, filepath: Path, sem: asyncio.Semaphore) -> bool:
+    """Generate speech for text and write it to filepath"""
+    global _consecutive_failures
+    
+    async with sem:
+        if _consecutive_failures >= CIRCUIT_BREAKER_THRESHOLD:
+            logger.debug(f"Skipping: {label}")
+            return False
+        
+        logger.debug(f"Generating: {label}")
+        result = await _generate_with_retry(text, filepath)
+    
+    if result.get("success"):
+        _consecutive_failures = 0
+        logger.debug(f"✅ Generated: {label}")
+        return True
+    
+    _consecutive_failures += 1
+    logger.error(f"❌ Failed: {label} ({result.get('error')})")
+    if _consecutive_failures == CIRCUIT_BREAKER_THRESHOLD:
+        logger.error(f"🛑 {CIRCUIT_BREAKER_THRESHOLD} files failed in a row; skipping the rest of this run")
+    return False
+
 async def generate_missing_audio():
     """Generate only missing audio files"""
     
@@ -116,60 +224,94 @@ async def generate_missing_audio():
     logger.info(f"❌ Missing segments: {len(missing_segments)}")
     logger.info(f"❌ Missing client names: {len(missing_clients)}")
     
-    # Generate missing segments
-    if missing_segments:
-        logger.info(f"\n🎵 Generating {len(missing_segments)} missing segments...")
-        for segment_name in missing_segments:
-            text = SCRIPT_SEGMENTS[segment_name]
-            logger.info(f"Generating: {segment_name}")
-            
-            result = await elevenlabs_client.generate_speech(text)
-            
-            if result.get("success") and result.get("audio_data"):
-                filepath = SEGMENTS_DIR / f"{segment_name}.mp3"
-                with open(filepath, "wb") as f:
-                    f.write(result["audio_data"])
-                logger.info(f"✅ Generated: {segment_name}")
-            else:
-                logger.error(f"❌ Failed: {segment_name}")
-            
-            # Small delay between requests
-            await asyncio.sleep(0.5)
-    
-    # Generate missing client names
-    if missing_clients:
-        logger.info(f"\n👥 Generating {len(missing_clients)} missing client names...")
-        for name in missing_clients:
-            logger.info(f"Generating: {name}")
-            
-            result = await elevenlabs_client.generate_speech(name)
-            
-            if result.get("success") and result.get("audio_data"):
-                filepath = CLIENT_NAMES_DIR / f"{name.lower()}.mp3"
-                with open(filepath, "wb") as f:
-                    f.write(result["audio_data"])
-                logger.info(f"✅ Generated: {name}")
-            else:
-                logger.error(f"❌ Failed: {name}")
-            
-            # Small delay between requests
-            await asyncio.sleep(0.5)
+    # Requests are network-bound, so run them in parallel up to the plan's concurrency limit
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    tasks = [
+        _synthesize_to(segment_name, SCRIPT_SEGMENTS[segment_name], SEGMENTS_DIR / f"{segment_name}.mp3", sem)
+        for segment_name in missing_segments
+    ] + [
+        _synthesize_to(name, name, CLIENT_NAMES_DIR / f"{name.lower()}.mp3", sem)
+        for name in missing_clients
+    ]
+    
+    if tasks:
+        # Open the pooled connection (TLS + key check) before the first real request is timed
+        voice_check = await elevenlabs_client.get_voice_info(settings.default_voice_id)
+        if not voice_check.get("success"):
+            logger.warning(f"⚠️ ElevenLabs prewarm failed: {voice_check.get('error')}")
+        
+        logger.info(f"\n🎵 Generating {len(tasks)} missing files ({MAX_CONCURRENT_REQUESTS} concurrent)...")
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        failed = [r for r in results if r is not True]
+        logger.info(f"✅ Generated {len(tasks) - len(failed)} of {len(tasks)} files")
+        if failed:
+            logger.error(f"❌ {len(failed)} of {len(tasks)} files failed to generate")
+    else:
+        results = []
+    
+    # Record the text each segment file was generated from
+    generated = [name for name, ok in zip(missing_segments, results) if ok is True]
+    index = load_segment_index()
+    updated = dict(index)
+    for name in existing_segments + generated:
+        updated[name] = _segment_hash(SCRIPT_SEGMENTS[name])
+    if updated != index:
+        save_segment_index(updated)
     
     # Update manifest
     await update_manifest()
     
+    await prebuild_concatenated_audio()
+    
     logger.info("\n✅ Audio generation complete!")
 
+async def prebuild_concatenated_audio():
+    """Pre-concatenate every personalized template into the segmented service's cache"""
+    from services.segmented_audio_service import segmented_audio_service
+    
+    if segmented_audio_service.base_dir.resolve() != OUTPUT_DIR:
+        logger.warning(
+            f"⚠️ Skipping pre-concatenation: the audio service resolves "
+            f"{segmented_audio_service.base_dir.resolve()}, run this script from {APP_DIR}"
+        )
+        return
+    
+    client_names = sorted(_existing_stems(CLIENT_NAMES_DIR))
+    agent_names = sorted(_existing_stems(AGENT_NAMES_DIR))
+    
+    jobs = []
+    for template_name, template in segmented_audio_service.templates.items():
+        if "[CLIENT_NAME]" in template["segments"]:
+            jobs += [(template_name, name, None) for name in client_names]
+        elif "[AGENT_NAME]" in template["segments"]:
+            jobs += [(template_name, None, name) for name in agent_names]
+    
+    if not jobs:
+        return
+    
+    # ffmpeg stream copies are CPU-light, but keep the number of subprocesses bounded
+    sem = asyncio.Semaphore(os.cpu_count() or 4)
+    
+    async def prebuild(template_name, client_name, agent_name):
+        async with sem:
+            return await segmented_audio_service.prebuild_personalized_audio(
+                template_name, client_name=client_name, agent_name=agent_name
+            )
+    
+    logger.info(f"\n🔗 Pre-concatenating {len(jobs)} personalized audio files...")
+    results = await asyncio.gather(*(prebuild(*job) for job in jobs), return_exceptions=True)
+    built = sum(1 for r in results if r is True)
+    logger.info(f"✅ Concatenated cache ready: {built} of {len(jobs)} files")
+
 async def update_manifest():
     """Update the segments manifest"""
     
-    # Get all existing files
-    segments = [f.stem for f in SEGMENTS_DIR.glob("*.mp3")]
-    client_names = [f.stem for f in CLIENT_NAMES_DIR.glob("*.mp3")]
-    agent_names = [f.stem for f in AGENT_NAMES_DIR.glob("*.mp3")]
+    # Get all existing files, scanning the three directories in parallel
+    segments, client_names, agent_names = await asyncio.gather(
+        *(asyncio.to_thread(_existing_stems, d) for d in (SEGMENTS_DIR, CLIENT_NAMES_DIR, AGENT_NAMES_DIR))
+    )
     
     manifest = {
-        "last_updated": datetime.utcnow().isoformat(),
         "segments": {
             "count": len(segments),
             "files": sorted(segments)
@@ -191,8 +333,19 @@ async def update_manifest():
     }
     
     manifest_path = OUTPUT_DIR / 'segments_manifest.json'
-    with open(manifest_path, 'w') as f:
-        json.dump(manifest, f, indent=2)
+    
+    # Leave the file (and its mtime) alone when nothing on disk changed
+    try:
+        current = orjson.loads(manifest_path.read_bytes())
+        current.pop("last_updated", None)
+        if current == manifest:
+            logger.info(f"📄 Manifest unchanged: {manifest_path}")
+            return
+    except (OSError, ValueError):
+        pass
+    
+    manifest = {"last_updated": datetime.utcnow().isoformat(), **manifest}
+    _write_json(manifest_path, manifest)
     
     logger.info(f"📄 Manifest updated: {manifest_path}")
 
@@ -205,7 +358,11 @@ async def main():
         logger.error("Please set ELEVENLABS_API_KEY in your .env file")
         return
     
-    await generate_missing_audio()
+    # All requests share the client's pooled HTTP/2 connections; close them once we're done
+    try:
+        await generate_missing_audio()
+    finally:
+        await elevenlabs_client.close()
 
 if __name__ == '__main__':
     # Import datetime for manifest
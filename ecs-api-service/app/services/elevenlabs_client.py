@@ -5,9 +5,11 @@ Optimized for ultra-fast text-to-speech generation
 
 import asyncio
 import httpx
-import json
+import orjson
 import logging
+import os
 import time
+from pathlib import Path
 from typing import Dict, Any, Optional, Union
 import hashlib
 
@@ -22,12 +24,14 @@ class ElevenLabsTTSClient:
         self.api_key = settings.elevenlabs_api_key
         self.base_url = "https://api.elevenlabs.io/v1"
         
-        # HTTP client with optimized settings
+        # HTTP client with optimized settings; HTTP/2 multiplexes concurrent TTS requests
+        # over the pooled connections instead of opening a TLS connection per request
         self.session = httpx.AsyncClient(
+            http2=True,
             timeout=15.0,  # Longer timeout for TTS generation
             limits=httpx.Limits(
-                max_keepalive_connections=5,
-                max_connections=20,
+                max_keepalive_connections=32,
+                max_connections=64,
                 keepalive_expiry=30.0
             )
         )
@@ -49,6 +53,8 @@ class ElevenLabsTTSClient:
             "use_speaker_boost": settings.use_speaker_boost,
             "speed": settings.voice_speed if hasattr(settings, 'voice_speed') else 0.87  # Default speed
         }
+        # Serialized once for cache keys; voice settings don't change after startup
+        self._voice_settings_key = orjson.dumps(self.voice_settings, option=orjson.OPT_SORT_KEYS).decode()
     
     def is_configured(self) -> bool:
         """Check if ElevenLabs is properly configured"""
@@ -82,7 +88,7 @@ class ElevenLabsTTSClient:
             voice_id = settings.default_voice_id
         
         # Check cache first
-        cache_key = self._create_cache_key(text, voice_id)
+        cache_key = self.cache_key(text, voice_id)
         if cache_key in self.audio_cache:
             logger.info(f"🔄 Using cached audio for: '{text[:30]}...'")
             return self.audio_cache[cache_key]
@@ -151,14 +157,21 @@ class ElevenLabsTTSClient:
                 elif response.status_code == 401:
                     error_msg += " (Invalid API key)"
                 
-                logger.error(f"❌ {error_msg}")
+                if response.status_code == 429:
+                    logger.warning(f"⚠️ {error_msg}")
+                else:
+                    logger.error(f"❌ {error_msg}")
                 self.errors_count += 1
                 
                 return {
                     "success": False,
                     "error": error_msg,
                     "audio_data": None,
-                    "latency_ms": latency
+                    "latency_ms": latency,
+                    "status_code": response.status_code,
+                    "retry_after": response.headers.get("retry-after"),
+                    "current_concurrent_requests": response.headers.get("current-concurrent-requests"),
+                    "maximum_concurrent_requests": response.headers.get("maximum-concurrent-requests")
                 }
                 
         except Exception as e:
@@ -173,6 +186,95 @@ class ElevenLabsTTSClient:
                 "latency_ms": latency
             }
     
+    async def stream_speech_to_file(
+        self,
+        text: str,
+        file_path: Union[str, Path],
+        voice_id: Optional[str] = None,
+        optimize_streaming_latency: int = 4,
+        output_format: str = "mp3_22050_32"
+    ) -> Dict[str, Any]:
+        """Stream generated speech straight to a file without buffering or caching it"""
+        from services.segmented_audio_service import run_audio_io
+        
+        if not self.is_configured():
+            return {"success": False, "error": "ElevenLabs API key not configured"}
+        
+        if not text.strip():
+            return {"success": False, "error": "Empty text provided"}
+        
+        voice_id = voice_id or settings.default_voice_id
+        url = f"{self.base_url}/text-to-speech/{voice_id}/stream"
+        headers = {
+            "Accept": "audio/mpeg",
+            "Content-Type": "application/json",
+            "xi-api-key": self.api_key
+        }
+        data = {
+            "text": self._clean_text_for_speech(text),
+            "model_id": settings.tts_model,
+            "voice_settings": self.voice_settings,
+            "optimize_streaming_latency": optimize_streaming_latency,
+            "output_format": output_format
+        }
+        
+        # Write to a temp name and rename on success so a failed stream never leaves a partial file
+        file_path = Path(file_path)
+        temp_path = file_path.with_name(file_path.name + ".part")
+        start_time = time.time()
+        
+        try:
+            async with self.session.stream("POST", url, headers=headers, json=data) as response:
+                if response.status_code != 200:
+                    latency = (time.time() - start_time) * 1000
+                    self.errors_count += 1
+                    error_msg = f"ElevenLabs API error: {response.status_code}"
+                    if response.status_code == 429:
+                        logger.warning(f"⚠️ {error_msg} (Rate limit exceeded)")
+                    else:
+                        logger.error(f"❌ {error_msg}")
+                    return {
+                        "success": False,
+                        "error": error_msg,
+                        "latency_ms": latency,
+                        "status_code": response.status_code,
+                        "retry_after": response.headers.get("retry-after"),
+                        "current_concurrent_requests": response.headers.get("current-concurrent-requests"),
+                        "maximum_concurrent_requests": response.headers.get("maximum-concurrent-requests")
+                    }
+                
+                size = 0
+                f = await run_audio_io(open, temp_path, "wb")
+                try:
+                    async for chunk in response.aiter_bytes(65536):
+                        await run_audio_io(f.write, chunk)
+                        size += len(chunk)
+                finally:
+                    await run_audio_io(f.close)
+            
+            await run_audio_io(os.replace, temp_path, file_path)
+            
+            latency = (time.time() - start_time) * 1000
+            self.total_latency += latency
+            self.generations_count += 1
+            self.total_characters += len(text)
+            
+            logger.info(f"🔊 TTS streamed in {latency:.0f}ms: '{text[:50]}...'")
+            return {"success": True, "file_size": size, "latency_ms": latency, "voice_id": voice_id}
+            
+        except Exception as e:
+            logger.error(f"❌ ElevenLabs TTS stream failed: {e}")
+            self.errors_count += 1
+            try:
+                temp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return {
+                "success": False,
+                "error": str(e),
+                "latency_ms": (time.time() - start_time) * 1000
+            }
+    
     def _clean_text_for_speech(self, text: str) -> str:
         """Clean and optimize text for natural speech synthesis"""
         # Remove or replace problematic characters
@@ -210,10 +312,10 @@ class ElevenLabsTTSClient:
         
         return text.strip()
     
-    def _create_cache_key(self, text: str, voice_id: str) -> str:
-        """Create cache key for audio"""
-        content = f"{text}:{voice_id}:{json.dumps(self.voice_settings, sort_keys=True)}"
-        return hashlib.md5(content.encode()).hexdigest()
+    def cache_key(self, text: str, voice_id: Optional[str] = None) -> str:
+        """Create cache key for audio of this text in the given voice, TTS model and voice settings"""
+        content = f"{text}:{voice_id or settings.default_voice_id}:{settings.tts_model}:{self._voice_settings_key}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
     
     async def get_available_voices(self) -> Dict[str, Any]:
         """Get available voices from ElevenLabs"""
@@ -303,5 +405,9 @@ class ElevenLabsTTSClient:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    async def close(self):
+        """Close HTTP client"""
+        await self.session.aclose()
+
 # Global instance
 elevenlabs_client = ElevenLabsTTSClient()
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+Shared HTTP Client
+One pooled, keep-alive httpx client reused by services instead of a client per instance
+"""
+
+import httpx
+import logging
+
+from shared.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 lets concurrent requests to the same vendor share one TLS connection
+shared_http_client = httpx.AsyncClient(
+    http2=True,
+    timeout=settings.webhook_timeout,
+    limits=httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=50,
+        keepalive_expiry=30.0
+    )
+)
+
+async def close_shared_http_client():
+    """Close the shared HTTP client (used on shutdown)"""
+    if not shared_http_client.is_closed:
+        await shared_http_client.aclose()
+        logger.info("Shared HTTP client closed")
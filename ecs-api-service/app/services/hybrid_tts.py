@@ -7,26 +7,57 @@ import asyncio
 import hashlib
 import httpx
 import logging
-import os
 import time
 import uuid
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from shared.config.settings import settings
+from services.segmented_audio_service import FULL_TEXT_TEMPLATES
 
 logger = logging.getLogger(__name__)
 
+# Generated dynamic audio is reused across calls for a day; the key carries the voice id and
+# voice settings, so changing the voice configuration starts a fresh set of entries. The files
+# live in this container's temp directory, so the cache is kept in process.
+TTS_CACHE_TTL_SECONDS = 86400
+TTS_CACHE_SIZE = 1024
+
+# Rendered template audio by (response_type, client_name, agent_name), kept in process and in Redis
+MAPPED_AUDIO_CACHE_PREFIX = "tts_mapped:"
+MAPPED_AUDIO_CACHE_SIZE = 1024
+# Entries picked up from Redis are only trusted locally for a short while
+MAPPED_AUDIO_REDIS_LOCAL_TTL_SECONDS = 300
+
+# Markdown stripped and symbols spoken out, applied in a single pass
+_TTS_SYMBOL_TABLE = str.maketrans({
+    "*": "",
+    "#": "",
+    "`": "",
+    "&": " and ",
+    "%": " percent ",
+    "@": " at "
+})
+
 class HybridTTSService:
     """Service that uses segmented audio for personalized responses"""
     
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         # Import segmented audio service
         from services.segmented_audio_service import segmented_audio_service
         self.segmented_service = segmented_audio_service
         
-        # ElevenLabs client for fallback
-        self.elevenlabs_session = httpx.AsyncClient(timeout=settings.webhook_timeout)
+        # ElevenLabs client for fallback - reuse the pooled connection instead of opening a new one
+        from services.http_client import shared_http_client
+        self.elevenlabs_session = client or shared_http_client
+        
+        # Template audio already rendered for a name pair, plus renders currently in flight
+        self._mapped_audio_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._mapped_audio_inflight: Dict[str, asyncio.Task] = {}
+        
+        # Dynamically generated audio by phrase
+        self._dynamic_audio_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
         
         # Performance tracking
         self.static_responses = 0
@@ -154,26 +185,90 @@ class HybridTTSService:
         client_data: Optional[Dict[str, Any]], 
         start_time: float
     ) -> Dict[str, Any]:
-        """Get response using mapped template"""
+        """Get response using mapped template, reusing audio already rendered for the same names"""
         
-        try:
-            mapping = self.response_mapping[response_type]
-            template_name = mapping["template"]
-            
-            # Extract names from client data
-            client_name = None
-            agent_name = None
+        mapping = self.response_mapping[response_type]
+        
+        # Extract names from client data
+        client_name = None
+        agent_name = None
+        
+        if client_data:
+            if mapping["needs_client_name"]:
+                client_name = (client_data.get("client_name") or 
+                             client_data.get("first_name") or
+                             client_data.get("name"))
             
-            if client_data:
-                if mapping["needs_client_name"]:
-                    client_name = (client_data.get("client_name") or 
-                                 client_data.get("first_name") or
-                                 client_data.get("name"))
-                
-                if mapping["needs_agent_name"]:
-                    agent_name = (client_data.get("agent_name") or
-                                client_data.get("last_agent") or
-                                client_data.get("assigned_agent"))
+            if mapping["needs_agent_name"]:
+                agent_name = (client_data.get("agent_name") or
+                            client_data.get("last_agent") or
+                            client_data.get("assigned_agent"))
+        
+        cache_key = hashlib.sha1(f"{response_type}|{client_name}|{agent_name}".encode("utf-8")).hexdigest()
+        cached = await self._get_cached_mapped_audio(cache_key)
+        if cached:
+            self.segmented_responses += 1
+            return {**cached, "generation_time_ms": (time.time() - start_time) * 1000}
+        
+        # Concurrent turns asking for the same audio share a single render
+        task = self._mapped_audio_inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._render_mapped_response(response_type, client_data, client_name, agent_name, start_time)
+            )
+            self._mapped_audio_inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._mapped_audio_inflight.pop(cache_key, None))
+            result = await asyncio.shield(task)
+            if result.get("success") and result.get("audio_url"):
+                await self._cache_mapped_audio(cache_key, result)
+            return result
+        return await asyncio.shield(task)
+    
+    async def _get_cached_mapped_audio(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up rendered template audio in process, then in Redis"""
+        entry = self._mapped_audio_cache.get(cache_key)
+        if entry:
+            expires_at, result = entry
+            if time.monotonic() < expires_at and self._temp_audio_exists(result["audio_url"]):
+                self._mapped_audio_cache.move_to_end(cache_key)
+                return result
+            del self._mapped_audio_cache[cache_key]
+        
+        # Redis entries may point at another container's temp files; only use ones present here
+        from shared.utils.redis_client import redis_client
+        result = await redis_client.get(MAPPED_AUDIO_CACHE_PREFIX + cache_key)
+        if isinstance(result, dict) and result.get("audio_url") and self._temp_audio_exists(result["audio_url"]):
+            self._remember_mapped_audio(cache_key, result, ttl=MAPPED_AUDIO_REDIS_LOCAL_TTL_SECONDS)
+            return result
+        return None
+    
+    async def _cache_mapped_audio(self, cache_key: str, result: Dict[str, Any]):
+        """Store rendered template audio in process and in Redis"""
+        entry = {key: result[key] for key in ("success", "audio_url", "type", "source") if key in result}
+        self._remember_mapped_audio(cache_key, entry)
+        
+        from shared.utils.redis_client import redis_client
+        await redis_client.set(MAPPED_AUDIO_CACHE_PREFIX + cache_key, entry, ttl=TTS_CACHE_TTL_SECONDS)
+    
+    def _remember_mapped_audio(self, cache_key: str, result: Dict[str, Any], ttl: int = TTS_CACHE_TTL_SECONDS):
+        """Record rendered template audio in the process-local LRU"""
+        self._mapped_audio_cache[cache_key] = (time.monotonic() + ttl, result)
+        self._mapped_audio_cache.move_to_end(cache_key)
+        while len(self._mapped_audio_cache) > MAPPED_AUDIO_CACHE_SIZE:
+            self._mapped_audio_cache.popitem(last=False)
+    
+    async def _render_mapped_response(
+        self,
+        response_type: str,
+        client_data: Optional[Dict[str, Any]],
+        client_name: Optional[str],
+        agent_name: Optional[str],
+        start_time: float
+    ) -> Dict[str, Any]:
+        """Render a mapped template through the segmented service"""
+        
+        try:
+            template_name = self.response_mapping[response_type]["template"]
             
             # Get personalized audio using segmented service
             result = await self.segmented_service.get_personalized_audio(
@@ -252,30 +347,35 @@ class HybridTTSService:
         try:
             # Import ElevenLabs client
             from services.elevenlabs_client import elevenlabs_client
+            from services.segmented_audio_service import run_audio_io
             
             # Clean and optimize text for TTS
             clean_text = self._clean_text_for_tts(text, client_data)
             
+            # Identical phrases across calls share one generated file
+            cache_key = elevenlabs_client.cache_key(" ".join(clean_text.split()))
+            cached = self._get_cached_dynamic_audio(cache_key)
+            if cached:
+                logger.info(f"⚡ TTS cache hit: {cache_key}")
+                return {"success": True, **cached}
+            
             # Generate speech
             result = await elevenlabs_client.generate_speech(clean_text)
             
             if result.get("success") and result.get("audio_data"):
-                # Save audio file
+                # Save audio file (the temp directory is created by the segmented audio service)
                 filename = f"dynamic_{uuid.uuid4().hex[:8]}.mp3"
+                filepath = self.segmented_service.temp_dir / filename
                 
-                os.makedirs("static/audio/temp", exist_ok=True)
-                filepath = f"static/audio/temp/{filename}"
-                
-                with open(filepath, "wb") as f:
-                    f.write(result["audio_data"])
+                await run_audio_io(filepath.write_bytes, result["audio_data"])
                 
                 audio_url = f"{settings.base_url.rstrip('/')}/static/audio/temp/{filename}"
+                entry = {"audio_url": audio_url, "file_size": len(result["audio_data"])}
+                self._dynamic_audio_cache[cache_key] = (time.monotonic() + TTS_CACHE_TTL_SECONDS, entry)
+                while len(self._dynamic_audio_cache) > TTS_CACHE_SIZE:
+                    self._dynamic_audio_cache.popitem(last=False)
                 
-                return {
-                    "success": True,
-                    "audio_url": audio_url,
-                    "file_size": len(result["audio_data"])
-                }
+                return {"success": True, **entry}
             
             else:
                 return {"success": False, "error": "TTS generation failed"}
@@ -284,6 +384,23 @@ class HybridTTSService:
             logger.error(f"Dynamic TTS generation error: {e}")
             return {"success": False, "error": str(e)}
     
+    def _get_cached_dynamic_audio(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up generated audio whose file is still in the temp directory"""
+        entry = self._dynamic_audio_cache.get(cache_key)
+        if not entry:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at or not self._temp_audio_exists(result["audio_url"]):
+            # Expired, or the temp file was cleaned up
+            del self._dynamic_audio_cache[cache_key]
+            return None
+        self._dynamic_audio_cache.move_to_end(cache_key)
+        return result
+    
+    def _temp_audio_exists(self, audio_url: str) -> bool:
+        """Whether the temp file behind a served audio URL exists in this container"""
+        return (self.segmented_service.temp_dir / audio_url.rsplit("/", 1)[-1]).is_file()
+    
     async def _fallback_to_dynamic(
         self, 
         response_type: str, 
@@ -322,29 +439,11 @@ class HybridTTSService:
     ) -> Optional[str]:
         """Build full text using AAG script templates with email scheduling"""
         
-        templates = {
-            "greeting": f"Hello {client_name or '[NAME]'}, Alex here from Altruis Advisor Group. We've helped you with your health insurance needs in the past and I just wanted to reach out to see if we can be of service to you this year during Open Enrollment? A simple Yes or No is fine, and remember, our services are completely free of charge.",
-            
-            "agent_introduction": f"Wonderful! I see that {agent_name or '[AGENT]'} was the last agent who helped you. I'd love to connect you with them again. We'll send you an email shortly with {agent_name or '[AGENT]'}'s available time slots, and you can choose what works best for your schedule. Does that sound good?",
-            
-            "schedule_confirmation": f"Perfect! You'll receive an email within the next few minutes with {agent_name or '[AGENT]'}'s calendar. Simply click on the time that works best for you, and it will automatically schedule your 15-minute discovery call. Thank you so much for your time today, and have a wonderful day!",
-            
-            "no_schedule_followup": f"I completely understand. {agent_name or '[AGENT]'} will make a note of our conversation, and we'll be here whenever you're ready to explore your options. Thank you for your time today. Have a wonderful day!",
-            
-            "not_interested": "No problem at all! Would you like to continue receiving occasional health insurance updates from our team? We promise to keep them informative and not overwhelming. A simple yes or no will do!",
-            
-            "dnc_confirmation": "I completely understand. I'll make sure you're removed from all future calls right away. You'll receive a confirmation email shortly. Our contact information will be in that email if you ever change your mind - remember, our service is always free. Have a wonderful day!",
-            
-            "keep_communications": "Great! We'll keep you in the loop with helpful health insurance updates throughout the year. If you ever need assistance, just reach out - we're always here to help, and our service is always free. Thank you for your time today!",
-            
-            "goodbye": "Thank you for your time today. Have a wonderful day!",
-            
-            "clarification": "I apologize, I didn't quite catch that. Would you be interested in reviewing your health insurance options for this year's open enrollment? A simple yes or no would be great.",
-            
-            "error": "I apologize, I'm having some technical difficulties. Thank you for your patience."
-        }
-        
-        return templates.get(response_type)
+        mapping = self.response_mapping.get(response_type)
+        template = FULL_TEXT_TEMPLATES.get(mapping["template"]) if mapping else None
+        if template is None:
+            return None
+        return template.format(client_name=client_name or '[NAME]', agent_name=agent_name or '[AGENT]')
     
     def _clean_text_for_tts(self, text: str, client_data: Optional[Dict[str, Any]] = None) -> str:
         """Clean and personalize text for optimal TTS"""
@@ -356,8 +455,7 @@ class HybridTTSService:
             text = text.replace("{agent_name}", client_data.get("agent_name", ""))
         
         # Clean up markdown and symbols
-        text = text.replace("**", "").replace("*", "").replace("#", "").replace("`", "")
-        text = text.replace("&", " and ").replace("%", " percent ").replace("@", " at ")
+        text = text.translate(_TTS_SYMBOL_TABLE)
         
         # Improve pronunciations
         text = text.replace("Dr.", "Doctor").replace("Mr.", "Mister").replace("Mrs.", "Missus")
@@ -5,7 +5,7 @@ Handles conversation and summary agent interactions
 
 import asyncio
 import httpx
-import json
+import orjson
 import logging
 import time
 from typing import Dict, Any, Optional
@@ -27,6 +27,7 @@ class LYZRAgentClient:
         
         # HTTP client with optimized settings
         self.session = httpx.AsyncClient(
+            http2=True,
             timeout=30.0,  # Longer timeout for AI processing
             limits=httpx.Limits(
                 max_keepalive_connections=5,
@@ -449,7 +450,7 @@ Focus on extracting actionable insights for the follow-up team."""
             
             if json_match:
                 json_str = json_match.group()
-                parsed = json.loads(json_str)
+                parsed = orjson.loads(json_str)
                 
                 # Validate required fields
                 if isinstance(parsed, dict):
@@ -548,5 +549,9 @@ Focus on extracting actionable insights for the follow-up team."""
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    async def close(self):
+        """Close HTTP client"""
+        await self.session.aclose()
+
 # Global instance
 lyzr_client = LYZRAgentClient()
\ No newline at end of file
@@ -7,9 +7,12 @@ import asyncio
 import hashlib
 import logging
 import os
+import shutil
 import subprocess
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -18,6 +21,44 @@ from shared.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# AAG script text per template, formatted with client_name/agent_name at call time; also the
+# dynamic TTS fallback text in hybrid_tts
+FULL_TEXT_TEMPLATES = {
+    "greeting": "Hello {client_name}, Alex here from Altruis Advisor Group. We've helped you with your health insurance needs in the past and I just wanted to reach out to see if we can be of service to you this year during Open Enrollment? A simple Yes or No is fine, and remember, our services are completely free of charge.",
+    
+    "agent_intro": "Great, looks like {agent_name} was the last agent you worked with here at Altruis. Would you like to schedule a quick 15-minute discovery call with them to get reacquainted? A simple Yes or No will do!",
+    
+    "schedule_confirmation": "Perfect! I'll send you an email shortly with {agent_name}'s available time slots. You can review the calendar and choose a time that works best for your schedule. Thank you so much for your time today, and have a wonderful day!",
+    
+    "no_schedule_followup": "No problem, {agent_name} will reach out to you and the two of you can work together to determine the best next steps. We look forward to servicing you, have a wonderful day!",
+    
+    "not_interested": "No problem, would you like to continue receiving general health insurance communications from our team? Again, a simple Yes or No will do!",
+    
+    "dnc_confirmation": "Understood, we will make sure you are removed from all future communications and send you a confirmation email once that is done. Our contact details will be in that email as well, so if you do change your mind in the future please feel free to reach out – we are always here to help and our service is always free of charge. Have a wonderful day!",
+    
+    "keep_communications": "Great, we're happy to keep you informed throughout the year regarding the ever-changing world of health insurance. If you'd like to connect with one of our insurance experts in the future please feel free to reach out – we are always here to help and our service is always free of charge. Have a wonderful day!",
+    
+    "goodbye": "Thank you for your time today. Have a wonderful day!",
+    
+    "clarification": "I want to make sure I understand correctly. Can we help service you this year during Open Enrollment? Please say Yes if you're interested, or No if you're not interested.",
+    
+    "error": "I apologize, I'm having some technical difficulties. Thank you for your patience."
+}
+
+# Blocking audio file I/O gets its own small pool so it never queues behind the default executor
+AUDIO_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="audio-io")
+
+async def run_audio_io(func, *args):
+    """Run a blocking audio file operation on the audio I/O pool"""
+    return await asyncio.get_running_loop().run_in_executor(AUDIO_IO_POOL, func, *args)
+
+_AGENT_FILENAME_TABLE = str.maketrans({" ": "_", ".": None})
+
+@lru_cache(maxsize=1024)
+def agent_filename(name: str) -> str:
+    """Filename stem used for an agent's name audio"""
+    return name.lower().translate(_AGENT_FILENAME_TABLE)
+
 class SegmentedAudioService:
     """Service for concatenating audio segments with real names"""
 
@@ -133,8 +174,7 @@ class SegmentedAudioService:
                 temp_filename = f"cached_{cache_key[:12]}_{uuid.uuid4().hex[:8]}.mp3"
                 temp_path = self.temp_dir / temp_filename
                 
-                import shutil
-                shutil.copy2(cached_file, temp_path)
+                await run_audio_io(shutil.copy2, cached_file, temp_path)
                 
                 audio_url = f"{settings.base_url.rstrip('/')}/static/audio/temp/{temp_filename}"
                 
@@ -191,8 +231,7 @@ class SegmentedAudioService:
                 temp_filename = f"static_{segment_name}_{uuid.uuid4().hex[:8]}.mp3"
                 temp_path = self.temp_dir / temp_filename
                 
-                import shutil
-                shutil.copy2(audio_file, temp_path)
+                await run_audio_io(shutil.copy2, audio_file, temp_path)
                 
                 audio_url = f"{settings.base_url.rstrip('/')}/static/audio/temp/{temp_filename}"
                 
@@ -264,8 +303,7 @@ class SegmentedAudioService:
             if success:
                 # Also save to cache
                 cache_path = self.cache_dir / f"{cache_key}.mp3"
-                import shutil
-                shutil.copy2(output_path, cache_path)
+                await run_audio_io(shutil.copy2, output_path, cache_path)
                 
                 audio_url = f"{settings.base_url.rstrip('/')}/static/audio/temp/{output_filename}"
                 return audio_url
@@ -276,6 +314,56 @@ class SegmentedAudioService:
             logger.error(f"❌ Concatenation error: {e}")
             return None
     
+    async def prebuild_personalized_audio(
+        self,
+        template_name: str,
+        client_name: Optional[str] = None,
+        agent_name: Optional[str] = None
+    ) -> bool:
+        """Concatenate a personalized template straight into the concatenated cache"""
+        
+        template = self.templates.get(template_name)
+        if not template or not self._needs_concatenation(template["segments"]):
+            return False
+        
+        # Only existing files are used; names are never generated here
+        audio_files = []
+        for segment in template["segments"]:
+            if segment == "[CLIENT_NAME]":
+                if not client_name:
+                    return False
+                audio_files.append(self.client_names_dir / f"{client_name.lower()}.mp3")
+            elif segment == "[AGENT_NAME]":
+                if not agent_name:
+                    return False
+                audio_files.append(self.agent_names_dir / f"{agent_filename(agent_name)}.mp3")
+            else:
+                audio_files.append(self.segments_dir / f"{segment}.mp3")
+        
+        try:
+            input_mtime = max(f.stat().st_mtime for f in audio_files)
+        except FileNotFoundError:
+            return False
+        
+        cache_key = self._generate_cache_key(template_name, client_name, agent_name)
+        cache_path = self.cache_dir / f"{cache_key}.mp3"
+        
+        # Rebuild only when a segment or name file is newer than the cached result
+        try:
+            if cache_path.stat().st_mtime >= input_mtime:
+                return True
+        except FileNotFoundError:
+            pass
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        part_path = self.cache_dir / f"{cache_key}.part.mp3"
+        
+        if not await self._ffmpeg_concatenate([str(f) for f in audio_files], str(part_path)):
+            return False
+        
+        await run_audio_io(os.replace, part_path, cache_path)
+        return True
+    
     async def _get_name_audio(self, name: str, name_type: str) -> Optional[str]:
         """Get audio file for a name (client or agent)"""
         
@@ -298,8 +386,7 @@ class SegmentedAudioService:
             
             elif name_type == "agent":
                 # Look for agent name audio - handle your specific agent names
-                agent_filename = name.lower().replace(' ', '_').replace('.', '')
-                name_file = self.agent_names_dir / f"{agent_filename}.mp3"
+                name_file = self.agent_names_dir / f"{agent_filename(name)}.mp3"
                 
                 if name_file.exists():
                     return str(name_file)
@@ -330,12 +417,11 @@ class SegmentedAudioService:
                     filename = f"{name.lower()}.mp3"
                     save_path = self.client_names_dir / filename
                 else:
-                    filename = f"{name.lower().replace(' ', '_')}.mp3"
+                    filename = f"{agent_filename(name)}.mp3"
                     save_path = self.agent_names_dir / filename
                 
-                # Save file
-                with open(save_path, "wb") as f:
-                    f.write(result["audio_data"])
+                # Save file without blocking the event loop
+                await run_audio_io(save_path.write_bytes, result["audio_data"])
                 
                 logger.info(f"✅ Generated name audio: {name}")
                 return str(save_path)
@@ -419,8 +505,7 @@ class SegmentedAudioService:
                     filename = f"fallback_{template_name}_{uuid.uuid4().hex[:8]}.mp3"
                     output_path = self.temp_dir / filename
                     
-                    with open(output_path, "wb") as f:
-                        f.write(result["audio_data"])
+                    await run_audio_io(output_path.write_bytes, result["audio_data"])
                     
                     audio_url = f"{settings.base_url.rstrip('/')}/static/audio/temp/{filename}"
                     
@@ -442,27 +527,10 @@ class SegmentedAudioService:
     def _build_full_text(self, template_name: str, client_name: Optional[str], agent_name: Optional[str]) -> Optional[str]:
         """Build full text for dynamic TTS based on AAG script"""
         
-        templates = {
-            "greeting": f"Hello {client_name or '[NAME]'}, Alex here from Altruis Advisor Group. We've helped you with your health insurance needs in the past and I just wanted to reach out to see if we can be of service to you this year during Open Enrollment? A simple Yes or No is fine, and remember, our services are completely free of charge.",
-            
-            "agent_intro": f"Great, looks like {agent_name or '[AGENT]'} was the last agent you worked with here at Altruis. Would you like to schedule a quick 15-minute discovery call with them to get reacquainted? A simple Yes or No will do!",
-            
-            "schedule_confirmation": f"Perfect! I'll send you an email shortly with {agent_name}'s available time slots. You can review the calendar and choose a time that works best for your schedule. Thank you so much for your time today, and have a wonderful day!",
-            
-            "no_schedule_followup": f"No problem, {agent_name or '[AGENT]'} will reach out to you and the two of you can work together to determine the best next steps. We look forward to servicing you, have a wonderful day!",
-            
-            "not_interested": "No problem, would you like to continue receiving general health insurance communications from our team? Again, a simple Yes or No will do!",
-            
-            "dnc_confirmation": "Understood, we will make sure you are removed from all future communications and send you a confirmation email once that is done. Our contact details will be in that email as well, so if you do change your mind in the future please feel free to reach out – we are always here to help and our service is always free of charge. Have a wonderful day!",
-            
-            "keep_communications": "Great, we're happy to keep you informed throughout the year regarding the ever-changing world of health insurance. If you'd like to connect with one of our insurance experts in the future please feel free to reach out – we are always here to help and our service is always free of charge. Have a wonderful day!",
-            
-            "goodbye": "Thank you for your time today. Have a wonderful day!",
-            
-            "clarification": "I want to make sure I understand correctly. Can we help service you this year during Open Enrollment? Please say Yes if you're interested, or No if you're not interested."
-        }
-        
-        return templates.get(template_name)
+        template = FULL_TEXT_TEMPLATES.get(template_name)
+        if template is None:
+            return None
+        return template.format(client_name=client_name or '[NAME]', agent_name=agent_name or '[AGENT]')
     
     def _generate_cache_key(self, template_name: str, client_name: Optional[str], agent_name: Optional[str]) -> str:
         """Generate cache key for personalized audio"""
@@ -473,7 +541,8 @@ class SegmentedAudioService:
             key_parts.append(f"client_{client_name.lower().replace(' ', '_')}")
         
         if agent_name:
-            key_parts.append(f"agent_{agent_name.lower().replace(' ', '_')}")
+            # Same normalization as the agent's audio file, so display names and file stems share a key
+            key_parts.append(f"agent_{agent_filename(agent_name)}")
         
         cache_key = "_".join(key_parts)
         
@@ -0,0 +1,104 @@
+"""
+TTS Prewarm
+Renders likely upcoming response audio in the background while Twilio plays the current prompt
+"""
+
+import asyncio
+import logging
+from typing import Optional, Dict, Any, Tuple
+
+from shared.models.call_session import CallSession, ConversationStage
+from shared.utils.redis_client import redis_client
+from services.hybrid_tts import hybrid_tts
+
+logger = logging.getLogger(__name__)
+
+# Likely next response categories for each conversation stage. While Twilio plays
+# the current prompt we synthesize these in the background so the next turn can
+# reuse the audio instead of waiting on TTS.
+NEXT_LIKELY: Dict[ConversationStage, Tuple[str, ...]] = {
+    ConversationStage.GREETING: ("agent_introduction", "not_interested", "clarification"),
+    ConversationStage.SCHEDULING: ("schedule_confirmation", "no_schedule_followup", "clarification"),
+    ConversationStage.DNC_CHECK: ("keep_communications", "dnc_confirmation", "clarification"),
+}
+PREWARM_TTL_SECONDS = 60
+_prewarm_semaphore = asyncio.Semaphore(4)
+_background_tasks: set = set()
+
+def _prewarm_key(session_id: str, response_type: str) -> str:
+    return f"prewarm:{session_id}:{response_type}"
+
+async def _prewarm_tts(session_id: str, stage: ConversationStage, client_data: Optional[Dict[str, Any]]):
+    """Speculatively generate audio for the likely next responses of a stage"""
+    if not redis_client.is_connected():
+        return
+
+    for response_type in NEXT_LIKELY.get(stage, ()):
+        try:
+            async with _prewarm_semaphore:
+                result = await hybrid_tts.get_response_audio(
+                    text="",
+                    response_type=response_type,
+                    client_data=client_data
+                )
+            if result.get("success") and result.get("audio_url"):
+                await redis_client.set(
+                    _prewarm_key(session_id, response_type),
+                    {"audio_url": result["audio_url"], "type": result.get("type", "prewarmed")},
+                    ttl=PREWARM_TTL_SECONDS
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ TTS prewarm failed for {response_type}: {e}")
+
+def schedule_tts_prewarm(session: CallSession):
+    """Start prewarming the next likely responses without blocking the webhook"""
+    if session.conversation_stage not in NEXT_LIKELY:
+        return
+    task = asyncio.create_task(
+        _prewarm_tts(session.session_id, session.conversation_stage, session.client_data)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+# Greetings are rendered at dial time, keyed by CallSid, and must survive the ring time
+GREETING_PRERENDER_TTL_SECONDS = 600
+
+async def _prerender_greeting(call_sid: str, client_data: Optional[Dict[str, Any]]):
+    """Render the greeting audio while the call is ringing"""
+    if not redis_client.is_connected():
+        return
+    
+    try:
+        async with _prewarm_semaphore:
+            result = await hybrid_tts.get_response_audio(
+                text="",
+                response_type="greeting",
+                client_data=client_data
+            )
+        if result.get("success") and result.get("audio_url"):
+            await redis_client.set(
+                _prewarm_key(call_sid, "greeting"),
+                {"audio_url": result["audio_url"], "type": result.get("type", "prerendered")},
+                ttl=GREETING_PRERENDER_TTL_SECONDS
+            )
+            logger.info(f"⚡ Greeting prerendered for {call_sid}")
+    except Exception as e:
+        logger.warning(f"⚠️ Greeting prerender failed for {call_sid}: {e}")
+
+def schedule_greeting_prerender(call_sid: str, client_data: Optional[Dict[str, Any]]):
+    """Start rendering the greeting for a call that was just dialed"""
+    task = asyncio.create_task(_prerender_greeting(call_sid, client_data))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def get_prewarmed_audio(session_id: Optional[str], response_type: str) -> Optional[Dict[str, Any]]:
+    """Return prewarmed audio for this session and response type if available"""
+    if not session_id or response_type not in hybrid_tts.response_mapping:
+        return None
+    try:
+        cached = await redis_client.get(_prewarm_key(session_id, response_type))
+        if isinstance(cached, dict) and cached.get("audio_url"):
+            return {"success": True, "generation_time_ms": 0, **cached}
+    except Exception as e:
+        logger.warning(f"⚠️ Prewarm lookup failed: {e}")
+    return None
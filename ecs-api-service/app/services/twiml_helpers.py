@@ -4,54 +4,61 @@ Creates Twilio XML responses for voice calls
 """
 
 import logging
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
 logger = logging.getLogger(__name__)
 
-def create_simple_twiml(message: str) -> str:
-    """Create simple TwiML response with Say verb"""
-    
-    # Clean message for TTS
-    clean_message = _clean_text_for_twiml(message)
-    
-    return f"""<?xml version="1.0" encoding="UTF-8"?>
+# Precompiled templates for the most frequently built responses
+_SIMPLE_TWIML = """<?xml version="1.0" encoding="UTF-8"?>
 <Response>
-    <Say voice="Polly.Joanna">{clean_message}</Say>
+    <Say voice="Polly.Joanna">%s</Say>
 </Response>"""
 
-def create_voice_twiml(
-    audio_url: str,
-    gather_action: str,
-    session_id: Optional[str] = None,
-    timeout: int = 5,
-    speech_timeout: str = "auto"
-) -> str:
-    """Create TwiML response with audio playback and speech gathering"""
-    
-    return f"""<?xml version="1.0" encoding="UTF-8"?>
+_VOICE_TWIML = """<?xml version="1.0" encoding="UTF-8"?>
 <Response>
-    <Play>{audio_url}</Play>
-    <Gather action="{gather_action}" method="POST" input="speech" timeout="{timeout}" speechTimeout="{speech_timeout}">
+    <Play>%s</Play>
+    <Gather action="%s" method="POST" input="speech" timeout="%s" speechTimeout="%s">
         <Say voice="Polly.Joanna">Please respond.</Say>
     </Gather>
     <Say voice="Polly.Joanna">I didn't hear you. Thank you for calling. Goodbye.</Say>
 </Response>"""
 
-def create_fallback_twiml(text: str, gather_action: str) -> str:
-    """Create fallback TwiML when audio generation fails"""
-    
-    clean_text = _clean_text_for_twiml(text)
-    
-    return f"""<?xml version="1.0" encoding="UTF-8"?>
+_FALLBACK_TWIML = """<?xml version="1.0" encoding="UTF-8"?>
 <Response>
-    <Say voice="Polly.Joanna">{clean_text}</Say>
-    <Gather action="{gather_action}" method="POST" input="speech" timeout="5" speechTimeout="auto">
+    <Say voice="Polly.Joanna">%s</Say>
+    <Gather action="%s" method="POST" input="speech" timeout="5" speechTimeout="auto">
         <Say voice="Polly.Joanna">Please respond.</Say>
     </Gather>
     <Say voice="Polly.Joanna">Thank you for your time. Goodbye.</Say>
 </Response>"""
 
-def create_media_stream_twiml(websocket_url: str) -> str:
+_HANGUP_TWIML = """<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+    <Say voice="Polly.Joanna">%s</Say>
+    <Hangup/>
+</Response>"""
+
+@lru_cache(maxsize=256)
+def create_simple_twiml(message: str) -> bytes:
+    """Create simple TwiML response with Say verb"""
+    return (_SIMPLE_TWIML % _clean_text_for_twiml(message)).encode("utf-8")
+
+def create_voice_twiml(
+    audio_url: str,
+    gather_action: str,
+    session_id: Optional[str] = None,
+    timeout: int = 5,
+    speech_timeout: str = "auto"
+) -> bytes:
+    """Create TwiML response with audio playback and speech gathering"""
+    return (_VOICE_TWIML % (audio_url, gather_action, timeout, speech_timeout)).encode("utf-8")
+
+def create_fallback_twiml(text: str, gather_action: str) -> bytes:
+    """Create fallback TwiML when audio generation fails"""
+    return (_FALLBACK_TWIML % (_clean_text_for_twiml(text), gather_action)).encode("utf-8")
+
+def create_media_stream_twiml(websocket_url: str) -> bytes:
     """Create TwiML response for media streaming"""
     
     return f"""<?xml version="1.0" encoding="UTF-8"?>
@@ -60,13 +67,13 @@ def create_media_stream_twiml(websocket_url: str) -> str:
     <Connect>
         <Stream url="{websocket_url}" />
     </Connect>
-</Response>"""
+</Response>""".encode("utf-8")
 
 def create_recording_twiml(
     recording_status_callback: str,
     max_length: int = 30,
     play_beep: bool = True
-) -> str:
+) -> bytes:
     """Create TwiML response for call recording"""
     
     beep = "true" if play_beep else "false"
@@ -81,13 +88,13 @@ def create_recording_twiml(
         playBeep="{beep}"
         recordingStatusCallback="{recording_status_callback}"
     />
-</Response>"""
+</Response>""".encode("utf-8")
 
 def create_conference_twiml(
     conference_name: str,
     wait_url: Optional[str] = None,
     muted: bool = False
-) -> str:
+) -> bytes:
     """Create TwiML response for conference calls"""
     
     muted_attr = 'muted="true"' if muted else ''
@@ -99,9 +106,9 @@ def create_conference_twiml(
     <Dial>
         <Conference {muted_attr} {wait_url_attr}>{conference_name}</Conference>
     </Dial>
-</Response>"""
+</Response>""".encode("utf-8")
 
-def create_transfer_twiml(phone_number: str, caller_id: Optional[str] = None) -> str:
+def create_transfer_twiml(phone_number: str, caller_id: Optional[str] = None) -> bytes:
     """Create TwiML response for call transfer"""
     
     caller_id_attr = f'callerId="{caller_id}"' if caller_id else ''
@@ -110,13 +117,13 @@ def create_transfer_twiml(phone_number: str, caller_id: Optional[str] = None) ->
 <Response>
     <Say voice="Polly.Joanna">Transferring your call.</Say>
     <Dial {caller_id_attr}>{phone_number}</Dial>
-</Response>"""
+</Response>""".encode("utf-8")
 
 def create_voicemail_twiml(
     recording_action: str,
     max_length: int = 120,
     beep_message: str = "Please leave a message after the beep."
-) -> str:
+) -> bytes:
     """Create TwiML response for voicemail"""
     
     clean_message = _clean_text_for_twiml(beep_message)
@@ -132,14 +139,14 @@ def create_voicemail_twiml(
         finishOnKey="#"
     />
     <Say voice="Polly.Joanna">Thank you for your message. Goodbye.</Say>
-</Response>"""
+</Response>""".encode("utf-8")
 
 def create_gather_digits_twiml(
     action: str,
     num_digits: int = 1,
     timeout: int = 5,
     prompt: str = "Press a number."
-) -> str:
+) -> bytes:
     """Create TwiML response for collecting digits"""
     
     clean_prompt = _clean_text_for_twiml(prompt)
@@ -150,53 +157,49 @@ def create_gather_digits_twiml(
         <Say voice="Polly.Joanna">{clean_prompt}</Say>
     </Gather>
     <Say voice="Polly.Joanna">I didn't receive input. Goodbye.</Say>
-</Response>"""
+</Response>""".encode("utf-8")
 
-def create_redirect_twiml(url: str) -> str:
+def create_redirect_twiml(url: str) -> bytes:
     """Create TwiML response to redirect call flow"""
     
     return f"""<?xml version="1.0" encoding="UTF-8"?>
 <Response>
     <Redirect>{url}</Redirect>
-</Response>"""
+</Response>""".encode("utf-8")
 
-def create_hangup_twiml(goodbye_message: str = "Thank you for calling. Goodbye.") -> str:
+@lru_cache(maxsize=256)
+def create_hangup_twiml(goodbye_message: str = "Thank you for calling. Goodbye.") -> bytes:
     """Create TwiML response to end call gracefully"""
-    
-    clean_message = _clean_text_for_twiml(goodbye_message)
-    
-    return f"""<?xml version="1.0" encoding="UTF-8"?>
-<Response>
-    <Say voice="Polly.Joanna">{clean_message}</Say>
-    <Hangup/>
-</Response>"""
+    return (_HANGUP_TWIML % _clean_text_for_twiml(goodbye_message)).encode("utf-8")
 
-def create_pause_twiml(length: int = 2) -> str:
+def create_pause_twiml(length: int = 2) -> bytes:
     """Create TwiML response with pause"""
     
     return f"""<?xml version="1.0" encoding="UTF-8"?>
 <Response>
     <Pause length="{length}"/>
-</Response>"""
-
+</Response>""".encode("utf-8")
+
+# XML-unsafe characters mapped to their entities, applied in a single pass
+_XML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&apos;"
+})
+
+@lru_cache(maxsize=4096)
 def _clean_text_for_twiml(text: str) -> str:
     """Clean text for TwiML XML compatibility"""
     
     if not text:
         return "Thank you for calling."
     
-    # Replace XML-unsafe characters
-    text = text.replace("&", "&amp;")
-    text = text.replace("<", "&lt;")
-    text = text.replace(">", "&gt;")
-    text = text.replace('"', "&quot;")
-    text = text.replace("'", "&apos;")
-    
-    # Remove line breaks and excessive whitespace
-    text = text.replace("\n", " ").replace("\r", " ")
+    # Collapse line breaks and excessive whitespace
     text = " ".join(text.split())
     
-    # Limit length for better voice experience
+    # Limit length for better voice experience (before escaping so entities are never cut)
     if len(text) > 500:
         sentences = text[:500].split('.')
         if len(sentences) > 1:
@@ -204,13 +207,14 @@ def _clean_text_for_twiml(text: str) -> str:
         else:
             text = text[:497] + "..."
     
-    return text.strip()
+    # Replace XML-unsafe characters
+    return text.translate(_XML_ESCAPE_TABLE).strip()
 
 # Advanced TwiML builders
 def create_dynamic_gather_twiml(
     config: Dict[str, Any],
     session_data: Optional[Dict[str, Any]] = None
-) -> str:
+) -> bytes:
     """Create dynamic TwiML based on configuration"""
     
     action = config.get('action', '/twilio/speech')
@@ -238,12 +242,12 @@ def create_dynamic_gather_twiml(
         <Say voice="Polly.Joanna">{clean_prompt}</Say>
     </Gather>
     <Say voice="Polly.Joanna">I didn't hear you. Thank you for calling.</Say>
-</Response>"""
+</Response>""".encode("utf-8")
 
 def create_conditional_twiml(
     conditions: Dict[str, str],
     default_message: str = "Thank you for calling."
-) -> str:
+) -> bytes:
     """Create conditional TwiML based on runtime conditions"""
     
     # This would be expanded with actual condition checking
@@ -6,6 +6,7 @@ Handles customer speech processing with proper state transitions
 import asyncio
 import httpx
 import logging
+import re
 import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -19,10 +20,14 @@ logger = logging.getLogger(__name__)
 class VoiceProcessor:
     """Service for processing customer speech and generating responses"""
     
-    def __init__(self):
-        self.httpx_client = httpx.AsyncClient(timeout=30.0)
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        from services.http_client import shared_http_client
+        self.httpx_client = client or shared_http_client
         self._configured = False
         
+        # Side tasks (e.g. meeting scheduling) that run alongside TTS for the reply
+        self._background_tasks: set = set()
+        
         # Common response patterns for faster processing
         self.response_patterns = {
             "yes_responses": ["yes", "yeah", "yep", "sure", "absolutely", "definitely", "of course", "okay", "ok", "sounds good", "that's fine", "it will"],
@@ -31,6 +36,12 @@ class VoiceProcessor:
             "dnc_requests": ["remove", "do not call", "don't call", "take me off", "unsubscribe", "stop calling"]
         }
         
+        # One whole-word regex per pattern group, so "no" no longer matches inside "know" or "ok" inside "took"
+        self._pattern_matchers = {
+            name: re.compile(r"\b(?:" + "|".join(re.escape(phrase) for phrase in phrases) + r")\b")
+            for name, phrases in self.response_patterns.items()
+        }
+        
         # Mark as configured
         self._configure()
     
@@ -144,19 +155,19 @@ class VoiceProcessor:
     
     def _is_interested(self, text: str) -> bool:
         """Check if input indicates interest"""
-        return any(word in text for word in self.response_patterns["yes_responses"])
+        return self._pattern_matchers["yes_responses"].search(text) is not None
     
     def _is_not_interested(self, text: str) -> bool:
         """Check if input indicates no interest"""
-        return any(word in text for word in self.response_patterns["no_responses"])
+        return self._pattern_matchers["no_responses"].search(text) is not None
     
     def _is_maybe(self, text: str) -> bool:
         """Check if input is uncertain"""
-        return any(word in text for word in self.response_patterns["maybe_responses"])
+        return self._pattern_matchers["maybe_responses"].search(text) is not None
     
     def _is_dnc_request(self, text: str) -> bool:
         """Check if input is a DNC request"""
-        return any(phrase in text for phrase in self.response_patterns["dnc_requests"])
+        return self._pattern_matchers["dnc_requests"].search(text) is not None
     
     # --- State transition handlers ---
     
@@ -214,9 +225,11 @@ class VoiceProcessor:
         # IMPORTANT: Move to GOODBYE and end conversation
         session.conversation_stage = ConversationStage.GOODBYE
         
-        # Try to schedule the meeting asynchronously
+        # Schedule the meeting in the background so the confirmation TTS isn't waiting on it
         try:
-            await self._schedule_meeting_async(session, agent_name)
+            task = asyncio.create_task(self._schedule_meeting_async(session, agent_name))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
         except Exception as e:
             logger.error(f"❌ Failed to schedule meeting: {e}")
         
@@ -476,8 +489,10 @@ class VoiceProcessor:
             logger.error(f"❌ Error in async meeting scheduling: {e}")
     
     async def close(self):
-        """Close HTTP client"""
-        await self.httpx_client.aclose()
+        """Close HTTP client (the shared client is closed on app shutdown)"""
+        from services.http_client import shared_http_client
+        if self.httpx_client is not shared_http_client:
+            await self.httpx_client.aclose()
 
 # Global instance
 voice_processor = VoiceProcessor()
\ No newline at end of file
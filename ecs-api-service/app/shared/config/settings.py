@@ -13,6 +13,8 @@ class Settings(BaseSettings):
     # Application Settings
     app_name: str = "Voice Agent Production"
     debug: bool = Field(default=False)
+    # Optional level for the Twilio webhook logger (e.g. "WARNING" to quiet per-call INFO logs)
+    twilio_log_level: Optional[str] = Field(default=None)
     environment: str = Field(default="development")
     host: str = Field(default="0.0.0.0")
     port: int = Field(default=8000)
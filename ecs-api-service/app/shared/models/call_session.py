@@ -150,6 +150,14 @@ class CallSession(BaseModel):
         # Update metrics
         self._update_metrics(turn)
     
+    def record_turn(self, turn: ConversationTurn, stage: ConversationStage):
+        """Record a processed turn and the stage it moved the conversation to in one step"""
+        if self.conversation_turns is None:
+            self.conversation_turns = []
+        self.conversation_turns.append(turn)
+        self.current_turn_number = turn.turn_number
+        self.conversation_stage = stage
+    
     def _update_metrics(self, turn: ConversationTurn):
         """Update session metrics with new turn data"""
         self.session_metrics.total_turns = len(self.conversation_turns)
@@ -5,6 +5,7 @@ DocumentDB/MongoDB connection and operations
 
 import asyncio
 import logging
+import re
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
@@ -19,6 +20,8 @@ from shared.models.call_session import CallSession
 
 logger = logging.getLogger(__name__)
 
+_NON_DIGITS = re.compile(r'\D')
+
 class DatabaseClient:
     """MongoDB/DocumentDB client wrapper"""
     
@@ -163,17 +166,9 @@ class ClientRepository:
     async def get_client_by_phone(self, phone: str) -> Optional[Client]:
         """Get client by phone number with multiple format handling"""
         try:
-            # First try exact match
-            doc = await self.db.clients.find_one({"client.phone": phone})
-            if doc:
-                doc["id"] = str(doc["_id"])
-                del doc["_id"]
-                return Client(**doc)
-            
-            # If no exact match, try normalized versions
+            # Try the exact number and its normalized versions in a single query
             # Remove all non-digits
-            import re
-            digits_only = re.sub(r'\D', '', phone)
+            digits_only = _NON_DIGITS.sub('', phone)
             
             # Try different formats
             phone_formats = []
@@ -186,13 +181,20 @@ class ClientRepository:
                 else:
                     phone_formats = [f"+{digits_only}", digits_only]
             
-            # Try each format
-            for format_phone in phone_formats:
-                doc = await self.db.clients.find_one({"client.phone": format_phone})
+            candidates = [phone] + [p for p in phone_formats if p != phone]
+            docs = await self.db.clients.find(
+                {"client.phone": {"$in": candidates}}
+            ).to_list(length=len(candidates))
+            
+            # Prefer the exact match, then formats in the order above
+            docs_by_phone = {doc["client"]["phone"]: doc for doc in docs}
+            for candidate in candidates:
+                doc = docs_by_phone.get(candidate)
                 if doc:
                     doc["id"] = str(doc["_id"])
                     del doc["_id"]
-                    logger.info(f"✅ Found client with phone format: {format_phone} (original: {phone})")
+                    if candidate != phone:
+                        logger.info(f"✅ Found client with phone format: {candidate} (original: {phone})")
                     return Client(**doc)
             
             logger.warning(f"⚠️ No client found for phone: {phone} (tried formats: {phone_formats})")
@@ -248,6 +250,41 @@ class ClientRepository:
             logger.error(f"Failed to add call attempt for client {client_id}: {e}")
             return False
     
+    async def record_completed_call(
+        self,
+        client_id: str,
+        call_attempt: Dict[str, Any],
+        crm_tags: Optional[List[CRMTag]] = None,
+        outcome: Optional[CallOutcome] = None,
+        updates: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Add a call attempt, its CRM tags, outcome and any field updates to a client in a single update"""
+        try:
+            if not ObjectId.is_valid(client_id):
+                return False
+            
+            now = datetime.utcnow()
+            fields = dict(updates or {})
+            fields["updatedAt"] = now
+            fields["lastContactAttempt"] = call_attempt.get("timestamp", now)
+            if outcome is not None:
+                fields["latestCallOutcome"] = outcome.value if hasattr(outcome, 'value') else str(outcome)
+            
+            update: Dict[str, Any] = {
+                "$push": {"callHistory": call_attempt},
+                "$inc": {"totalAttempts": 1},
+                "$set": fields
+            }
+            if crm_tags:
+                update["$addToSet"] = {"crmTags": {"$each": [tag.value for tag in crm_tags]}}
+            
+            result = await self.db.clients.update_one({"_id": ObjectId(client_id)}, update)
+            
+            return result.modified_count > 0
+        except Exception as e:
+            logger.error(f"Failed to record completed call for client {client_id}: {e}")
+            return False
+    
     async def assign_agent(self, client_id: str, agent_id: str, agent_name: str = None) -> bool:
         """Assign agent to client"""
         try:
@@ -3,10 +3,10 @@ Redis Cache Utilities
 High-performance caching for session data and temporary storage
 """
 
-import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 from datetime import datetime, timedelta
+import orjson
 import redis.asyncio as redis
 from redis.exceptions import ConnectionError, RedisError
 
@@ -15,6 +15,12 @@ from shared.models.call_session import CallSession, SessionCache
 
 logger = logging.getLogger(__name__)
 
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a cached value to JSON bytes"""
+    return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS)
+
 class RedisClient:
     """Async Redis client wrapper for caching"""
     
@@ -69,7 +75,7 @@ class RedisClient:
         try:
             # Serialize value
             if isinstance(value, (dict, list)):
-                value = json.dumps(value, default=str)
+                value = _dumps(value)
             elif not isinstance(value, (str, bytes, int, float)):
                 value = str(value)
             
@@ -83,6 +89,17 @@ class RedisClient:
             logger.error(f"Redis SET error: {e}")
             return False
     
+    async def set_nx(self, key: str, value: Any, ttl: int) -> bool:
+        """Set a value only if the key does not exist yet (SET NX EX)"""
+        if not self._connected:
+            return False
+        
+        try:
+            return bool(await self.client.set(key, value, ex=ttl, nx=True))
+        except Exception as e:
+            logger.error(f"Redis SET NX error: {e}")
+            return False
+    
     async def get(self, key: str, default: Any = None) -> Any:
         """Get a value from Redis"""
         if not self._connected:
@@ -95,8 +112,8 @@ class RedisClient:
             
             # Try to deserialize JSON
             try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
+                return orjson.loads(value)
+            except (orjson.JSONDecodeError, TypeError):
                 return value.decode('utf-8') if isinstance(value, bytes) else value
         except Exception as e:
             logger.error(f"Redis GET error: {e}")
@@ -148,6 +165,29 @@ class RedisClient:
             logger.error(f"Redis EXPIRE error: {e}")
             return False
     
+    async def rpush(self, key: str, *values: str) -> Optional[int]:
+        """Append values to a list, returning the new length"""
+        if not self._connected:
+            return None
+        
+        try:
+            return await self.client.rpush(key, *values)
+        except Exception as e:
+            logger.error(f"Redis RPUSH error: {e}")
+            return None
+    
+    async def lrange(self, key: str, start: int = 0, end: int = -1) -> List[str]:
+        """Get a range of values from a list"""
+        if not self._connected:
+            return []
+        
+        try:
+            values = await self.client.lrange(key, start, end)
+            return [value.decode('utf-8') if isinstance(value, bytes) else value for value in values]
+        except Exception as e:
+            logger.error(f"Redis LRANGE error: {e}")
+            return []
+    
     async def keys(self, pattern: str) -> List[str]:
         """Get keys matching pattern"""
         if not self._connected:
@@ -167,7 +207,7 @@ class RedisClient:
         
         try:
             if isinstance(value, (dict, list)):
-                value = json.dumps(value, default=str)
+                value = _dumps(value)
             elif not isinstance(value, (str, bytes, int, float)):
                 value = str(value)
             
@@ -189,8 +229,8 @@ class RedisClient:
             
             # Try to deserialize JSON
             try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
+                return orjson.loads(value)
+            except (orjson.JSONDecodeError, TypeError):
                 return value.decode('utf-8') if isinstance(value, bytes) else value
         except Exception as e:
             logger.error(f"Redis HGET error: {e}")
@@ -210,8 +250,8 @@ class RedisClient:
                 
                 # Try to deserialize JSON
                 try:
-                    decoded_result[field_str] = json.loads(value)
-                except (json.JSONDecodeError, TypeError):
+                    decoded_result[field_str] = orjson.loads(value)
+                except (orjson.JSONDecodeError, TypeError):
                     decoded_result[field_str] = value.decode('utf-8') if isinstance(value, bytes) else value
             
             return decoded_result
@@ -225,17 +265,25 @@ class SessionCache:
     def __init__(self, redis_client: RedisClient):
         self.redis = redis_client
         self.session_prefix = "session:"
+        self.session_fields_prefix = "session_fields:"
+        self.session_turns_prefix = "session_turns:"
+        self.call_sid_prefix = "session_sid:"
         self.active_calls_key = "active_calls"
         self.metrics_prefix = "metrics:"
     
     async def save_session(self, session: CallSession) -> bool:
         """Save session to cache"""
         key = f"{self.session_prefix}{session.session_id}"
-        session_data = session.model_dump(mode='json')
+        # Pydantic serializes straight to JSON in Rust, skipping the intermediate dict
+        session_data = session.model_dump_json()
         
         success = await self.redis.set(key, session_data, ttl=settings.session_cache_ttl)
         
         if success:
+            # The full document supersedes any partial field updates
+            await self.redis.delete(f"{self.session_fields_prefix}{session.session_id}")
+            if session.twilio_call_sid:
+                await self.redis.set(f"{self.call_sid_prefix}{session.twilio_call_sid}", session.session_id, ttl=settings.session_cache_ttl)
             # Add to active calls set
             await self.redis.hset(
                 self.active_calls_key,
@@ -250,13 +298,114 @@ class SessionCache:
         
         return success
     
+    async def save_sessions(self, sessions: List[CallSession]) -> bool:
+        """Save several sessions to cache in one pipelined round-trip"""
+        if not sessions or not self.redis.is_connected():
+            return False
+        
+        try:
+            pipe = self.redis.client.pipeline(transaction=False)
+            for session in sessions:
+                key = f"{self.session_prefix}{session.session_id}"
+                pipe.setex(key, settings.session_cache_ttl, session.model_dump_json())
+                pipe.delete(f"{self.session_fields_prefix}{session.session_id}")
+                if session.twilio_call_sid:
+                    pipe.setex(f"{self.call_sid_prefix}{session.twilio_call_sid}", settings.session_cache_ttl, session.session_id)
+                pipe.hset(
+                    self.active_calls_key,
+                    session.session_id,
+                    _dumps({
+                        "phone_number": session.phone_number,
+                        "status": session.call_status.value,
+                        "started_at": session.started_at.isoformat(),
+                        "twilio_call_sid": session.twilio_call_sid
+                    })
+                )
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis batch session save error: {e}")
+            return False
+    
+    async def save_session_fields(self, updates: List[Tuple[CallSession, Set[str]]]) -> bool:
+        """Write only the given fields of each session, pipelined in one round-trip"""
+        if not updates or not self.redis.is_connected():
+            return False
+        
+        try:
+            pipe = self.redis.client.pipeline(transaction=False)
+            # Position of each session's base-document EXPIRE in the pipeline results
+            base_expire_index = []
+            for session, fields in updates:
+                fields_key = f"{self.session_fields_prefix}{session.session_id}"
+                field_data = session.model_dump(mode='json', include=fields)
+                if field_data:
+                    pipe.hset(fields_key, mapping={name: _dumps(value) for name, value in field_data.items()})
+                    pipe.expire(fields_key, settings.session_cache_ttl)
+                base_expire_index.append(len(pipe.command_stack))
+                pipe.expire(f"{self.session_prefix}{session.session_id}", settings.session_cache_ttl)
+                if "call_status" in fields:
+                    pipe.hset(
+                        self.active_calls_key,
+                        session.session_id,
+                        _dumps({
+                            "phone_number": session.phone_number,
+                            "status": session.call_status.value,
+                            "started_at": session.started_at.isoformat(),
+                            "twilio_call_sid": session.twilio_call_sid
+                        })
+                    )
+            results = await pipe.execute()
+            
+            # Field updates are meaningless without the base document (evicted or never
+            # cached), so write those sessions in full instead
+            missing = [session for (session, _), i in zip(updates, base_expire_index) if not results[i]]
+            if missing:
+                return await self.save_sessions(missing)
+            return True
+        except Exception as e:
+            logger.error(f"Redis session field save error: {e}")
+            return False
+    
+    async def append_turn(self, session_id: str, turn: Any) -> bool:
+        """Append a conversation turn to the session's turn list"""
+        if not self.redis.is_connected():
+            return False
+        
+        try:
+            turns_key = f"{self.session_turns_prefix}{session_id}"
+            pipe = self.redis.client.pipeline(transaction=False)
+            pipe.rpush(turns_key, turn.model_dump_json())
+            pipe.expire(turns_key, settings.session_cache_ttl)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis turn append error: {e}")
+            return False
+    
     async def get_session(self, session_id: str) -> Optional[CallSession]:
-        """Get session from cache"""
-        key = f"{self.session_prefix}{session_id}"
-        session_data = await self.redis.get(key)
+        """Get session from cache, applying any field updates and appended turns"""
+        if not self.redis.is_connected():
+            return None
         
-        if session_data:
+        try:
+            pipe = self.redis.client.pipeline(transaction=False)
+            pipe.get(f"{self.session_prefix}{session_id}")
+            pipe.hgetall(f"{self.session_fields_prefix}{session_id}")
+            pipe.lrange(f"{self.session_turns_prefix}{session_id}", 0, -1)
+            raw_session, raw_fields, raw_turns = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis session read error: {e}")
+            return None
+        
+        if raw_session:
             try:
+                session_data = orjson.loads(raw_session)
+                for field, value in raw_fields.items():
+                    session_data[field.decode('utf-8') if isinstance(field, bytes) else field] = orjson.loads(value)
+                # The turn list is only authoritative when it is ahead of the stored document
+                if len(raw_turns) > len(session_data.get("conversation_turns") or []):
+                    session_data["conversation_turns"] = [orjson.loads(turn) for turn in raw_turns]
                 return CallSession(**session_data)
             except Exception as e:
                 logger.error(f"Failed to deserialize session {session_id}: {e}")
@@ -264,12 +413,21 @@ class SessionCache:
         
         return None
     
+    async def get_session_by_call_sid(self, call_sid: str) -> Optional[CallSession]:
+        """Get session from cache by its Twilio call SID"""
+        session_id = await self.redis.get(f"{self.call_sid_prefix}{call_sid}")
+        if not session_id:
+            return None
+        return await self.get_session(str(session_id))
+    
     async def delete_session(self, session_id: str) -> bool:
         """Delete session from cache"""
         key = f"{self.session_prefix}{session_id}"
         
         # Remove from both session cache and active calls
         deleted = await self.redis.delete(key)
+        await self.redis.delete(f"{self.session_fields_prefix}{session_id}")
+        await self.redis.delete(f"{self.session_turns_prefix}{session_id}")
         await self.redis.client.hdel(self.active_calls_key, session_id)
         
         return deleted